@@ -4,9 +4,9 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 
-from .const import DOMAIN, CATLINK_COORDINATOR, PLATFORMS, UPDATE_LISTENER
+from .const import DOMAIN, CATLINK_COORDINATOR, PLATFORMS, UPDATE_LISTENER, SERVICE_RESCAN_DEVICES
 from .coordinator import CatlinkDevicesCoordinator
 
 
@@ -18,6 +18,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     coordinator = CatlinkDevicesCoordinator(hass, entry)
     await coordinator.async_config_entry_first_refresh()
+    coordinator.async_setup_children()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         CATLINK_COORDINATOR: coordinator
     }
@@ -27,6 +28,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     update_listener = entry.add_update_listener(async_update_options)
     hass.data[DOMAIN][entry.entry_id][UPDATE_LISTENER] = update_listener
 
+    if not hass.services.has_service(DOMAIN, SERVICE_RESCAN_DEVICES):
+        async def async_rescan_devices(call: ServiceCall) -> None:
+            """Re-list devices of every Catlink account."""
+            for config_entry in hass.config_entries.async_entries(DOMAIN):
+                if entry_data := hass.data.get(DOMAIN, {}).get(config_entry.entry_id):
+                    await entry_data[CATLINK_COORDINATOR].async_rescan_devices()
+
+        hass.services.async_register(DOMAIN, SERVICE_RESCAN_DEVICES, async_rescan_devices)
+
     return True
 
 
@@ -34,9 +44,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload PetKit config entry."""
 
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        del hass.data[DOMAIN][entry.entry_id]
-        if not hass.data[DOMAIN]:
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data[CATLINK_COORDINATOR].async_shutdown()
+        if not any(
+            config_entry.entry_id in hass.data[DOMAIN]
+            for config_entry in hass.config_entries.async_entries(DOMAIN)
+        ):
             del hass.data[DOMAIN]
+            hass.services.async_remove(DOMAIN, SERVICE_RESCAN_DEVICES)
     return unload_ok
 
 
@@ -0,0 +1,216 @@
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .circuit_breaker import STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+from .const import DOMAIN
+from .coordinator import CatlinkDevicesCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CatlinkAccountEntity(CoordinatorEntity):
+    """Base of the diagnostic entities of a Catlink account."""
+
+    coordinator: CatlinkDevicesCoordinator
+
+    @property
+    def phone(self) -> str:
+        return self.coordinator.client.phone
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device registry information for this entity."""
+        return {
+            "identifiers": {(DOMAIN, f'account_{self.phone}')},
+            "name": f'Catlink {self.phone}',
+            "manufacturer": "Catlink",
+            "model": "Cloud account",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+
+    @property
+    def has_entity_name(self) -> bool:
+        """Indicate that entity has name defined."""
+        return True
+
+    @property
+    def entity_category(self) -> EntityCategory:
+        """Set category to diagnostic."""
+        return EntityCategory.DIAGNOSTIC
+
+
+class CatlinkCloudCircuitState(CatlinkAccountEntity, SensorEntity):
+    """State of the circuit breaker guarding the Catlink cloud API."""
+
+    @property
+    def unique_id(self) -> str:
+        """Sets unique ID for this entity."""
+        return f'{self.phone}_cloud_circuit_state'
+
+    @property
+    def translation_key(self) -> str:
+        """Translation key for this entity."""
+        return "cloud_circuit_state"
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        return SensorDeviceClass.ENUM
+
+    @property
+    def options(self) -> list[str]:
+        return [STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN]
+
+    @property
+    def native_value(self) -> str:
+        return self.coordinator.client.breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            'consecutive_failures': self.coordinator.client.breaker.failures,
+            'stale': bool(self.coordinator.data and self.coordinator.data.stale),
+        }
+
+    @property
+    def icon(self) -> str | None:
+        """Set status icon."""
+        return 'mdi:cloud-check' if self.native_value == STATE_CLOSED else 'mdi:cloud-alert'
+
+
+class CatlinkRateLimiterLevel(CatlinkAccountEntity, SensorEntity):
+    """Fill level of the request rate limiter shared by the accounts."""
+
+    @property
+    def unique_id(self) -> str:
+        """Sets unique ID for this entity."""
+        return f'{self.phone}_rate_limiter_level'
+
+    @property
+    def translation_key(self) -> str:
+        """Translation key for this entity."""
+        return "rate_limiter_level"
+
+    @property
+    def available(self) -> bool:
+        return super().available and self.coordinator.client.rate_limiter is not None
+
+    @property
+    def native_value(self) -> float | None:
+        if limiter := self.coordinator.client.rate_limiter:
+            return round(limiter.level, 1)
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        if limiter := self.coordinator.client.rate_limiter:
+            return {
+                'capacity': limiter.capacity,
+                'rate': limiter.rate,
+            }
+        return {}
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def icon(self) -> str | None:
+        """Set status icon."""
+        return 'mdi:car-speed-limiter'
+
+
+class CatlinkRateLimiterThrottledTime(CatlinkAccountEntity, SensorEntity):
+    """Total time requests waited on the shared rate limiter."""
+
+    @property
+    def unique_id(self) -> str:
+        """Sets unique ID for this entity."""
+        return f'{self.phone}_rate_limiter_throttled_time'
+
+    @property
+    def translation_key(self) -> str:
+        """Translation key for this entity."""
+        return "rate_limiter_throttled_time"
+
+    @property
+    def available(self) -> bool:
+        return super().available and self.coordinator.client.rate_limiter is not None
+
+    @property
+    def native_value(self) -> float | None:
+        if limiter := self.coordinator.client.rate_limiter:
+            return round(limiter.throttled_time, 2)
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        if limiter := self.coordinator.client.rate_limiter:
+            return {
+                'throttled_requests': limiter.throttled_requests,
+            }
+        return {}
+
+    @property
+    def device_class(self) -> SensorDeviceClass:
+        return SensorDeviceClass.DURATION
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        return UnitOfTime.SECONDS
+
+    @property
+    def icon(self) -> str | None:
+        """Set status icon."""
+        return 'mdi:timer-sand'
+
+
+class CatlinkQuarantinedDevices(CatlinkAccountEntity, SensorEntity):
+    """Devices of the account that failed too often and are only probed rarely."""
+
+    @property
+    def unique_id(self) -> str:
+        """Sets unique ID for this entity."""
+        return f'{self.phone}_quarantined_devices'
+
+    @property
+    def translation_key(self) -> str:
+        """Translation key for this entity."""
+        return "quarantined_devices"
+
+    @property
+    def available(self) -> bool:
+        return super().available and self.coordinator.client.poll_planner is not None
+
+    @property
+    def native_value(self) -> int | None:
+        if planner := self.coordinator.client.poll_planner:
+            return len(planner.quarantined)
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        if planner := self.coordinator.client.poll_planner:
+            return {
+                'quarantined': planner.quarantined,
+                'offline': planner.offline,
+                'poll_intervals': planner.intervals(),
+            }
+        return {}
+
+    @property
+    def state_class(self) -> SensorStateClass:
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def icon(self) -> str | None:
+        """Set status icon."""
+        return 'mdi:lan-disconnect' if self.native_value else 'mdi:lan-check'
@@ -8,7 +8,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .catlink_client import CatlinkClient
-from .const import TIMEOUT
+from .const import TIMEOUT, DEFAULT_API_BASE
+from .rate_limiter import async_get_rate_limiter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +22,8 @@ async def async_validate_api(hass: HomeAssistant, phone: str, password: str) ->
         password,
         session=async_get_clientsession(hass),
         timeout=TIMEOUT,
+        hass=hass,
+        rate_limiter=async_get_rate_limiter(hass, DEFAULT_API_BASE),
     )
 
     async with async_timeout.timeout(TIMEOUT):
@@ -24,7 +24,8 @@ async def async_setup_entry(hass: HomeAssistant,
     binary_sensors = []
 
     for ft_id, fountain in coordinator.data.water_fountains.items():
+        device_coordinator = coordinator.device_coordinator(ft_id)
         binary_sensors.extend((
-            WaterFountainNightMode(coordinator, ft_id),
+            WaterFountainNightMode(device_coordinator, ft_id),
         ))
     async_add_entities(binary_sensors)
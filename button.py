@@ -1,9 +1,14 @@
 import logging
+
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.components.sensor import (
     DOMAIN as ENTITY_DOMAIN,
 )
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .feeder_device import *
@@ -12,7 +17,11 @@ from .scooper_device import *
 from .coordinator import CatlinkDevicesCoordinator
 from .const import (
     DOMAIN,
-    CATLINK_COORDINATOR
+    CATLINK_COORDINATOR,
+    SERVICE_DISPENSE,
+    ATTR_PORTIONS,
+    FEEDER_FOOD_OUT_MIN,
+    FEEDER_FOOD_OUT_MAX,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,19 +35,39 @@ async def async_setup_entry(hass: HomeAssistant,
     buttons = []
 
     for ft_id, fountain in coordinator.data.water_fountains.items():
+        device_coordinator = coordinator.device_coordinator(ft_id)
         buttons.extend((
-            WaterFountainFluffyHair(coordinator, ft_id),
+            WaterFountainFluffyHair(device_coordinator, ft_id),
 
         ))
 
     for feeder_id, feeder in coordinator.data.feeders.items():
+        device_coordinator = coordinator.device_coordinator(feeder_id)
         buttons.extend((
-            FeederFoodOutButton(coordinator, feeder_id),
+            FeederFoodOutButton(device_coordinator, feeder_id),
         ))
 
     for scooper_id, scooper in coordinator.data.litter_boxes.items():
+        device_coordinator = coordinator.device_coordinator(scooper_id)
         buttons.extend((
-            ScooperActionStart(coordinator, scooper_id),
-            ScooperActionPause(coordinator, scooper_id),
+            ScooperActionStart(device_coordinator, scooper_id),
+            ScooperActionPause(device_coordinator, scooper_id),
         ))
     async_add_entities(buttons)
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_DISPENSE,
+        {
+            vol.Optional(ATTR_PORTIONS): vol.All(
+                vol.Coerce(int), vol.Range(min=FEEDER_FOOD_OUT_MIN, max=FEEDER_FOOD_OUT_MAX)),
+        },
+        async_dispense,
+    )
+
+
+async def async_dispense(entity: ButtonEntity, call: ServiceCall) -> None:
+    """Dispense from a feeder food out button, rejecting the other buttons."""
+    if not isinstance(entity, FeederFoodOutButton):
+        raise ServiceValidationError(f'{entity.entity_id} is not a feeder food out button')
+    await entity.async_dispense(call.data.get(ATTR_PORTIONS))
@@ -1,10 +1,16 @@
+import asyncio
 import base64
+import dataclasses
 import datetime
+import functools
 import hashlib
 import logging
+import random
 import time
+from contextvars import ContextVar
+from typing import Any
 
-from aiohttp import ClientSession, ClientConnectorError
+from aiohttp import ClientSession, ClientError, ClientTimeout
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import padding
@@ -15,16 +21,40 @@ from tzlocal import get_localzone_name
 
 from .const import *
 from .data_model import CatlinkData, Feeder, WaterFountain, LitterBox
-from .exceptions import AuthError, NoDevicesError
+from .circuit_breaker import CircuitBreaker, STATE_HALF_OPEN
+from .poll_planner import AdaptivePollPlanner
+from .shared_devices import SharedDeviceRegistry
+from .rate_limiter import TokenBucket
+from .scheduler import PrioritySemaphore, PRIORITY_COMMAND, PRIORITY_POLL
+from .exceptions import AuthError, NoDevicesError, CircuitOpenError, PollBudgetExhausted
 
 _LOGGER = logging.getLogger(__name__)
 
-TIMEOUT = 5 * 60
+LOGIN_API = 'login/password'
+
+# Monotonic time by which the current poll must be finished; requests get the remaining budget as timeout.
+poll_deadline: ContextVar[float | None] = ContextVar('poll_deadline', default=None)
+
+
+@functools.cache
+def load_public_key():
+    """Parse the Catlink RSA public key once per process."""
+    return serialization.load_der_public_key(base64.b64decode(RSA_PUBLIC_KEY), default_backend())
 
 
 class CatlinkClient:
     def __init__(self, phone: str, password: str,
-                 session: ClientSession | None = None, timeout: int = TIMEOUT) -> None:
+                 session: ClientSession | None = None, timeout: int = TIMEOUT,
+                 hass: HomeAssistant | None = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 device_cache_ttl: int = DEFAULT_DEVICE_CACHE_TTL,
+                 refresh_intervals: dict[str, int] | None = None,
+                 retry_policies: dict[str, dict] | None = None,
+                 poll_budget: float = DEFAULT_POLL_BUDGET,
+                 breaker: CircuitBreaker | None = None,
+                 rate_limiter: TokenBucket | None = None,
+                 poll_planner: AdaptivePollPlanner | None = None,
+                 shared_devices: SharedDeviceRegistry | None = None) -> None:
         self.phone: str = phone
         self.pwd: str = password
         self.base_url: str = ''
@@ -32,31 +62,132 @@ class CatlinkClient:
         self.tz: str = get_localzone_name()
         self.timeout: int = timeout
         self.token: str | None = None
+        self.hass: HomeAssistant | None = hass
+        self._login_lock = asyncio.Lock()
+        self._login_generation: int = 0
+        self._login_result: bool = False
+        self._login_error: Exception | None = None
+        self._store: Store | None = None
+        self._auth: dict | None = None
+        self._password: str | None = None
+        self._semaphore = PrioritySemaphore(max_concurrency)
+        self.device_cache_ttl: int = device_cache_ttl
+        self._devices: list[dict] | None = None
+        self._devices_updated_at: float = 0
+        self.refresh_intervals: dict[str, int] = {**DEFAULT_REFRESH_INTERVALS, **(refresh_intervals or {})}
+        self._payloads: dict[tuple, tuple[float, Any]] = {}
+        self.retry_policies: dict[str, dict] = {**RETRY_POLICIES, **(retry_policies or {})}
+        self.poll_budget: float = poll_budget
+        self._snapshots: dict[int, Feeder | LitterBox | WaterFountain] = {}
+        self.breaker: CircuitBreaker = breaker or CircuitBreaker(
+            phone, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        self.rate_limiter: TokenBucket | None = rate_limiter
+        self.poll_planner: AdaptivePollPlanner | None = poll_planner
+        self.shared_devices: SharedDeviceRegistry | None = shared_devices
 
     @property
     def password(self):
-        password = self.pwd
-        if len(password) <= 16:
-            password = self.encrypt_password(password)
-        return password
+        if self._password is None:
+            password = self.pwd
+            if len(password) <= 16:
+                password = self.encrypt_password(password)
+            self._password = password
+        return self._password
+
+    async def request(self, api, pms=None, method='GET', endpoint: str | None = None,
+                      priority: int | None = None, **kwargs):
+        """Send an API request, logging in again once when the token has expired.
+
+        Concurrent requests hitting an expired token share a single login and
+        are replayed with the new token afterwards. GET requests are retried
+        according to the retry policy of their ``endpoint`` family.
+
+        Requests wait for a slot by ``priority``: by default reads queue as
+        background polling and writes as user commands, which go out first.
+        """
+        if priority is None:
+            priority = PRIORITY_POLL if method.upper() == 'GET' else PRIORITY_COMMAND
+        kwargs['priority'] = priority
+        token = self.token
+        resp = await self._request_with_retry(api, pms, method, token, endpoint, **kwargs)
+        if resp.get('returnCode') == 1002 and api != LOGIN_API and self.hass:  # Illegal token
+            if await self.async_relogin(token):
+                resp = await self._request_with_retry(api, pms, method, self.token, endpoint, **kwargs)
+        return resp
+
+    async def _request_with_retry(self, api, pms, method, token, endpoint, **kwargs):
+        policy = NO_RETRY_POLICY
+        if method.upper() == 'GET':
+            policy = self.retry_policies.get(endpoint, DEFAULT_RETRY_POLICY)
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(f'Catlink API circuit is open, skipped {api}')
+            try:
+                resp = await self._request(api, pms, method, token, **kwargs)
+                self.breaker.record_success()
+                return resp
+            except PollBudgetExhausted:
+                # Local overload, not a cloud failure: neither retried nor counted.
+                raise
+            except (ClientError, TimeoutError) as exc:
+                self.breaker.record_failure()
+                # Exponential backoff with full jitter.
+                delay = random.uniform(0, min(policy['max_delay'], policy['base_delay'] * 2 ** (attempt - 1)))
+                deadline = poll_deadline.get()
+                if attempt >= policy['attempts'] or (deadline and time.monotonic() + delay >= deadline):
+                    _LOGGER.error('Request api failed after %s attempts: %s', attempt, [method, api, exc])
+                    return {}
+                _LOGGER.debug('Request api %s failed, retrying in %.1fs: %s', api, delay, exc)
+                await asyncio.sleep(delay)
+            except Exception:
+                # Malformed responses count as failures too.
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # A cancelled probe must not leave the breaker half open.
+                if self.breaker.state == STATE_HALF_OPEN:
+                    self.breaker.record_failure()
+                raise
+
+    async def async_relogin(self, stale_token: str | None) -> bool:
+        """Log in behind a lock, unless another caller already replaced ``stale_token``.
 
-    async def request(self, api, pms=None, method='GET', **kwargs):
+        Callers queued behind a login share its outcome, a failed login is not retried by each of them.
+        """
+        generation = self._login_generation
+        async with self._login_lock:
+            if self._login_generation != generation:
+                if self._login_error is not None:
+                    raise self._login_error
+                return self._login_result
+            if self.token and self.token != stale_token:
+                return True
+            self._login_generation += 1
+            try:
+                self._login_result = await self.async_login(self.hass)
+                self._login_error = None
+            except Exception as exc:
+                self._login_result = False
+                self._login_error = exc
+                raise
+            return self._login_result
+
+    async def _request(self, api, pms, method, token, priority=PRIORITY_POLL, **kwargs):
         method = method.upper()
-        pms_cloned = pms.copy()
+        pms_cloned = dict(pms or {})
         url = self.api_url(api)
         kws = {
-            'timeout': 60,
             'headers': {
                 'language': 'zh_CN',
                 'User-Agent': 'okhttp/3.10.0',
             },
         }
         kws.update(kwargs)
-        if pms_cloned is None:
-            pms_cloned = {}
         pms_cloned['noncestr'] = int(time.time() * 1000)
-        if self.token:
-            pms_cloned[CONF_TOKEN] = self.token
+        if token:
+            pms_cloned[CONF_TOKEN] = token
         pms_cloned['sign'] = self.params_sign(pms_cloned)
         if method in ['GET']:
             kws['params'] = pms_cloned
@@ -65,15 +196,36 @@ class CatlinkClient:
             kws['params'] = pms_cloned
         else:
             kws['data'] = pms_cloned
+        # _LOGGER.warning('Req %s, %s, %s', method, url, kws)
+        deadline = poll_deadline.get()
+        # Waiting in our own queues is bounded by the poll budget only, it is no cloud failure.
         try:
-            # _LOGGER.warning('Req %s, %s, %s', method, url, kws)
-            req = await self._session.request(method, url, **kws)
-            resp = await req.json() or {}
-            # _LOGGER.warning('Resp %s', resp)
-            return resp
-        except (ClientConnectorError, TimeoutError) as exc:
-            _LOGGER.error('Request api failed: %s', [method, url, pms_cloned, exc])
-        return {}
+            async with asyncio.timeout(deadline - time.monotonic() if deadline else None):
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire(priority)
+                await self._semaphore.acquire(priority)
+        except TimeoutError as exc:
+            raise PollBudgetExhausted(f'Poll budget exhausted while queueing {api}') from exc
+        try:
+            timeout = REQUEST_TIMEOUT
+            if deadline:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    raise PollBudgetExhausted(f'Poll budget exhausted before requesting {api}')
+            kws['timeout'] = ClientTimeout(total=timeout)
+            try:
+                async with asyncio.timeout(timeout):
+                    req = await self._session.request(method, url, **kws)
+                    resp = await req.json() or {}
+            except TimeoutError as exc:
+                # A request cut short by the poll budget says nothing about the cloud.
+                if timeout < REQUEST_TIMEOUT:
+                    raise PollBudgetExhausted(f'Poll budget exhausted while requesting {api}') from exc
+                raise
+        finally:
+            self._semaphore.release()
+        # _LOGGER.warning('Resp %s', resp)
+        return resp
 
     def api_url(self, api=''):
         if api[:6] == 'https:' or api[:5] == 'http:':
@@ -82,16 +234,19 @@ class CatlinkClient:
         return f"{bas.rstrip('/')}/{api.lstrip('/')}"
 
     async def async_login(self, hass: HomeAssistant):
+        password = self._password
+        if password is None:
+            password = await hass.async_add_executor_job(lambda: self.password)
         pms = {
             'platform': 'ANDROID',
             'internationalCode': '86',
             'mobile': self.phone,
-            'password': self.password,
+            'password': password,
         }
         self.token = None
 
-        response = await self.request('login/password', pms, 'POST')
-        if response['returnCode'] == 2002:
+        response = await self.request(LOGIN_API, pms, 'POST')
+        if response.get('returnCode') == 2002:
             raise AuthError('username or password is incorrect! login failed! msg:%s', response['msg'])
         token = response.get('data', {}).get('token')
         if not token:
@@ -101,10 +256,21 @@ class CatlinkClient:
         await self.async_check_auth(hass, True)
         return True
 
+    def auth_store(self, hass: HomeAssistant) -> Store:
+        if self._store is None:
+            fileName = f'{DOMAIN}/auth-{self.phone}.json'
+            self._store = Store(hass, 1, fileName)
+        return self._store
+
     async def async_check_auth(self, hass: HomeAssistant, save=False):
-        fileName = f'{DOMAIN}/auth-{self.phone}.json'
-        store = Store(hass, 1, fileName)
-        old = await store.async_load() or {}
+        """Make sure a token is available, keeping it in memory between polls.
+
+        The auth Store is only read once and written (debounced) after a login.
+        """
+        store = self.auth_store(hass)
+        if self._auth is None:
+            self._auth = await store.async_load() or {}
+        old = self._auth
         if save:
             cfg = {
                 CONF_PHONE: self.phone,
@@ -114,39 +280,63 @@ class CatlinkClient:
                 cfg['update_at'] = old.get('update_at')
             else:
                 cfg['update_at'] = f'{datetime.datetime.today()}'
-            await store.async_save(cfg)
+            self._auth = cfg
+            store.async_delay_save(lambda: cfg, AUTH_SAVE_DELAY)
             return cfg
+        if self.token:
+            return old
         if old.get(CONF_TOKEN):
             self.token = old.get(CONF_TOKEN)
         else:
-            await self.async_login(hass)
+            await self.async_relogin(None)
         return old
 
-    async def get_devices(self, hass: HomeAssistant):
+    def invalidate_devices(self) -> None:
+        """Expire the cached device inventory so the next poll lists devices again."""
+        self._devices_updated_at = 0
+
+    async def get_devices(self, hass: HomeAssistant, force: bool = False):
+        if not force and self._devices is not None \
+                and time.monotonic() - self._devices_updated_at < self.device_cache_ttl:
+            return self._devices
+
         await self.async_check_auth(hass)
-        own_list = await self.get_devices_0('token/device/union/ownList', hass)
-        shared_list = await self.get_devices_0('token/device/union/sharedList', hass)
+        own_list, shared_list = await asyncio.gather(
+            self.get_devices_0('token/device/union/ownList', hass),
+            self.get_devices_0('token/device/union/sharedList', hass),
+        )
 
         device_dict = dict()
-        for device in own_list:
-            if device['id'] not in device_dict:
-                device_dict[device['id']] = device
-        for device in shared_list:
+        for source, device in [
+            *((DEVICE_SOURCE_OWN, device) for device in own_list),
+            *((DEVICE_SOURCE_SHARED, device) for device in shared_list),
+        ]:
             if device['id'] not in device_dict:
-                device_dict[device['id']] = device
+                device_dict[device['id']] = {**device, DEVICE_SOURCE: source}
 
-        device_list = device_dict.values()
+        device_list = list(device_dict.values())
         if not device_list:
             _LOGGER.warning(
                 'Got devices for %s failed, \nowned:%s \nshared:%s', self.phone, own_list, shared_list)
+            if self._devices:
+                return self._devices
+        else:
+            self._devices = device_list
+            self._devices_updated_at = time.monotonic()
+            for key in [key for key in self._payloads if key[0] not in device_dict]:
+                del self._payloads[key]
+            for device_id in [device_id for device_id in self._snapshots if device_id not in device_dict]:
+                del self._snapshots[device_id]
+            if self.shared_devices is not None:
+                self.shared_devices.sync_inventory(self.phone, device_dict)
         return device_list
 
     async def get_devices_0(self, api: str, hass: HomeAssistant):
-        rsp = await self.request(api, {'type': 'NONE'})
-        eno = rsp.get('returnCode', 0)
-        if eno == 1002:  # Illegal token
-            if await self.async_login(hass):
-                rsp = await self.request(api)
+        try:
+            rsp = await self.request(api, {'type': 'NONE'}, endpoint=ENDPOINT_DEVICES)
+        except PollBudgetExhausted as error:
+            _LOGGER.debug('Skipped listing devices of %s: %s', self.phone, error)
+            return []
         device_list = rsp.get('data', {}).get(CONF_DEVICES) or []
         return device_list
 
@@ -167,92 +357,270 @@ class CatlinkClient:
         pwd = f'{pwd}'
         md5 = hashlib.md5(pwd.encode()).hexdigest().lower()
         sha = hashlib.sha1(md5.encode()).hexdigest().upper()
-        pub = serialization.load_der_public_key(base64.b64decode(RSA_PUBLIC_KEY), default_backend())
+        pub = load_public_key()
         pad = padding.PKCS1v15()
         return base64.b64encode(pub.encrypt(sha.encode(), pad)).decode()
 
-    async def get_catlink_data(self, hass: HomeAssistant) -> CatlinkData:
-        """Fetch data for all Catlink devices."""
+    async def get_catlink_data(self, hass: HomeAssistant, poll_devices: bool = True,
+                               budget: float | None = None) -> CatlinkData:
+        """Fetch data for all Catlink devices.
 
-        device_list = await self.get_devices(hass)
+        Without ``poll_devices`` only the inventory is refreshed and devices
+        are fetched when they have no snapshot yet, their polling being left
+        to per-device coordinators. The poll is bounded by ``budget`` seconds,
+        the client poll budget by default.
+        """
 
+        if self.breaker.is_open:
+            raise CircuitOpenError('Catlink API circuit is open')
 
         fountains_data: dict[int, WaterFountain] = {}
         feeders_data: dict[int, Feeder] = {}
         litter_boxes_data: dict[int, LitterBox] = {}
 
-        if device_list:
-            for device in device_list:
-                if device['deviceType'] in DETAIL_URL_MAPPING:
-                    device_type = device['deviceType']
-                    device_id = device['id']
-
-                    params = {'deviceId': device_id}
-                    detail_url = DETAIL_URL_MAPPING[device_type]
-                    try:
-                        device_detail_response = await self.request(detail_url, params)
-                        detail_data = device_detail_response.get('data', {}).get('deviceInfo') or {}
-                    except (TypeError, ValueError) as exc:
-                        detail_data = []
-                        _LOGGER.error('Got device logs for %s failed: %s', device_type, device_detail_response)
-
-                    event_url = LOG_URL_MAPPING[device_type]
-                    try:
-                        event_response = await self.request(event_url, params)
-                        event_data = event_response.get('data', {}).get(LOG_DATA_NODE_MAPPING[device_type]) or []
-                    except (TypeError, ValueError) as exc:
-                        event_data = []
-                        _LOGGER.error('Got device logs for %s failed: %s', device_type, event_response)
-
-                    wifi_info_url = WIFI_INFO_URL_MAPPING[device_type]
-                    try:
-                        wifi_response = await self.request(wifi_info_url, params)
-                        wifi_info_data = wifi_response.get('data', {}).get('wifiInfo') or {}
-                    except (TypeError, ValueError) as exc:
-                        wifi_info_data = []
-                        _LOGGER.error('Got device logs for %s failed: %s', device_type, wifi_response)
-
-                    if device_type == 'PURE3':
-                        fountains_data[device_id] = \
-                            await self.get_water_fountain(device, detail_data, event_data, wifi_info_data)
-                    elif device_type == 'FEEDER':
-                        feeders_data[device_id] = Feeder(id=device_id,
-                                                         device_attrs=device,
-                                                         device_detail=detail_data,
-                                                         event_record=event_data,
-                                                         wifi_info=wifi_info_data,
-                                                         type=device_type)
-                    elif device_type == 'SCOOPER':
-                        litter_boxes_data[device_id] = LitterBox(id=device_id,
-                                                                 device_attrs=device,
-                                                                 device_detail=detail_data,
-                                                                 event_record=event_data,
-                                                                 wifi_info=wifi_info_data,
-                                                                 type=device_type)
+        deadline = time.monotonic() + (self.poll_budget if budget is None else budget)
+        deadline_token = poll_deadline.set(deadline)
+        try:
+            device_list = await self.get_devices(hass)
+            shard = None
+            if poll_devices and self.poll_planner is not None and self.poll_planner.shards > 1:
+                shard = self.poll_planner.next_shard(device['id'] for device in device_list or [])
+            tasks = {
+                device['id']: asyncio.create_task(
+                    self.poll_device(device) if device['id'] in self._snapshots else self.fetch_new_device(device))
+                for device in device_list or []
+                if device['deviceType'] in DETAIL_URL_MAPPING and not self.adopt_shared(device)
+                and (self.is_poll_due(device['id'], shard) if poll_devices else device['id'] not in self._snapshots)
+            }
+            if tasks:
+                await asyncio.wait(tasks.values(), timeout=max(deadline - time.monotonic(), 0))
+        finally:
+            poll_deadline.reset(deadline_token)
+        # Devices without a snapshot have no last data to fall back on, their first fetch is awaited in full.
+        first_fetches = [task for device_id, task in tasks.items()
+                         if device_id not in self._snapshots and not task.done()]
+        if first_fetches:
+            await asyncio.wait(first_fetches)
+
+        for device_id, task in tasks.items():
+            if not task.done():
+                task.cancel()
+                _LOGGER.warning('Device %s did not finish within the poll budget, keeping its last data', device_id)
+            elif isinstance(task.exception(), (AuthError, CircuitOpenError)):
+                raise task.exception()
+            elif task.exception():
+                _LOGGER.error('Got data of device %s failed: %s', device_id, task.exception())
+                if self.poll_planner is not None:
+                    self.poll_planner.record_failure(device_id)
+            elif task.result() is None:
+                _LOGGER.warning('Got no detail of device %s, fetching it again on the next poll', device_id)
+            else:
+                self.store_snapshot(task.result())
+        # Devices that were not due keep their last snapshot.
+        results = [self._snapshots[device['id']] for device in device_list or [] if device['id'] in self._snapshots]
+        for device_data in results:
+            if isinstance(device_data, WaterFountain):
+                fountains_data[device_data.id] = device_data
+            elif isinstance(device_data, Feeder):
+                feeders_data[device_data.id] = device_data
+            elif isinstance(device_data, LitterBox):
+                litter_boxes_data[device_data.id] = device_data
         return CatlinkData(uid=self.phone,
                            water_fountains=fountains_data, feeders=feeders_data, litter_boxes=litter_boxes_data)
 
-    async def get_water_fountain(self, device_attr, detail_data, event_data, wifi_info_data) -> WaterFountain:
-        device_type = device_attr['deviceType']
-        device_id = device_attr['id']
+    def get_device(self, device_id) -> dict | None:
+        """Return the inventory entry of a device."""
+        for device in self._devices or []:
+            if device['id'] == device_id:
+                return device
+        return None
 
-        fountain_cat_data_url = CAT_STATISTIC_MAPPING[device_type]
-        cat_data_param = {
-            'deviceId': device_id,
-            'pageNumber': 1,
-            'pageSize': 3
-        }
+    async def refresh_device(self, device_id, force: bool = True) -> Feeder | LitterBox | WaterFountain | None:
+        """Fetch the endpoints of a single device and patch its entry in the last snapshot.
+
+        Every endpoint is requested when ``force`` is set, otherwise only those whose tier is due.
+        """
+
+        device = self.get_device(device_id)
+        if not device or device['deviceType'] not in DETAIL_URL_MAPPING:
+            return None
+        device_data = await self.get_device_data(device, force)
+        if device_data is not None:
+            self.store_snapshot(device_data)
+        return device_data
+
+    async def poll_single_device(self, device_id,
+                                 budget: float | None = None) -> Feeder | LitterBox | WaterFountain | None:
+        """Poll one device within its own poll budget, for per-device coordinators.
+
+        Failures other than auth and an open circuit are raised after backing the device off.
+        """
+
+        if self.breaker.is_open:
+            raise CircuitOpenError('Catlink API circuit is open')
+        device = self.get_device(device_id)
+        if not device or device['deviceType'] not in DETAIL_URL_MAPPING:
+            return None
+        if self.adopt_shared(device):
+            return self._snapshots[device_id]
+        deadline_token = poll_deadline.set(time.monotonic() + (self.poll_budget if budget is None else budget))
         try:
-            fountain_cat_data_response = await self.request(fountain_cat_data_url, cat_data_param)
-            fountain_cat_data = fountain_cat_data_response.get('data', {}).get('catInfo', {}).get('singleData') or []
-        except (TypeError, ValueError) as exc:
-            fountain_cat_data = []
-            _LOGGER.error('Got cat statistic for %s failed: %s', device_type, fountain_cat_data_response)
-
-        return WaterFountain(id=device_id,
-                             device_attrs=device_attr,
+            device_data = await self.poll_device(device)
+        except (AuthError, CircuitOpenError):
+            raise
+        except Exception:
+            if self.poll_planner is not None:
+                self.poll_planner.record_failure(device_id)
+            raise
+        finally:
+            poll_deadline.reset(deadline_token)
+        if device_data is not None:
+            self.store_snapshot(device_data)
+        return device_data
+
+    async def refresh_device_detail(self, device_id) -> Feeder | LitterBox | WaterFountain | None:
+        """Fetch only the detail endpoint of a device and patch its last snapshot."""
+
+        device = self.get_device(device_id)
+        if not device or device_id not in self._snapshots:
+            return None
+        self.store_snapshot(await self.get_device_detail_data(device))
+        return self._snapshots[device_id]
+
+    async def poll_device(self, device) -> Feeder | LitterBox | WaterFountain | None:
+        """Fetch a device for the account poll, only its detail while it is offline or failing."""
+
+        if (self.poll_planner is not None and device['id'] in self._snapshots
+                and self.poll_planner.is_degraded(device['id'])):
+            return await self.get_device_detail_data(device)
+        return await self.get_device_data(device)
+
+    async def fetch_new_device(self, device) -> Feeder | LitterBox | WaterFountain | None:
+        """Fetch a device that has no snapshot yet, outside of the poll budget."""
+
+        poll_deadline.set(None)
+        return await self.get_device_data(device)
+
+    async def get_device_detail_data(self, device) -> Feeder | LitterBox | WaterFountain:
+        """Return the last snapshot of a device patched with a fresh detail."""
+
+        device_id = device['id']
+        detail_data = await self.get_device_node(device_id, ENDPOINT_DETAIL, DETAIL_URL_MAPPING[device['deviceType']],
+                                                 {'deviceId': device_id}, ('deviceInfo',), {})
+        return dataclasses.replace(self._snapshots[device_id], device_detail=detail_data)
+
+    def is_poll_due(self, device_id, shard: set[int] | None = None) -> bool:
+        """Tell whether a device has to be fetched by the current account poll.
+
+        With a ``shard``, only its devices and busy ones are fetched.
+        """
+        if self.poll_planner is None or device_id not in self._snapshots:
+            return True
+        if shard is not None and device_id not in shard and not self.poll_planner.is_busy(device_id):
+            return False
+        return self.poll_planner.is_due(device_id)
+
+    def adopt_shared(self, device) -> bool:
+        """Take the snapshot of a device fetched by another account instead of polling it."""
+        if self.shared_devices is None or self.shared_devices.claim(device['id'], self.phone, device.get(DEVICE_SOURCE)):
+            return False
+        snapshot = self.shared_devices.snapshot(device['id'])
+        if snapshot is None:
+            return False
+        self._snapshots[device['id']] = snapshot
+        return True
+
+    def store_snapshot(self, device_data: Feeder | LitterBox | WaterFountain) -> None:
+        if self.poll_planner is not None:
+            self.poll_planner.schedule(self._snapshots.get(device_data.id), device_data)
+        self._snapshots[device_data.id] = device_data
+        if self.shared_devices is not None:
+            self.shared_devices.publish(self.phone, device_data)
+
+    async def get_device_data(self, device, force: bool = False) -> Feeder | LitterBox | WaterFountain | None:
+        """Fetch the endpoints of one device concurrently, honouring their refresh tiers unless ``force``."""
+
+        device_type = device['deviceType']
+        device_id = device['id']
+        params = {'deviceId': device_id}
+        # The activity of a fountain is read from new drinks in its log, which the planner only sees when fresh.
+        force_log = force or (device_type == 'PURE3' and self.poll_planner is not None)
+
+        requests = [
+            self.get_device_node(device_id, ENDPOINT_DETAIL, DETAIL_URL_MAPPING[device_type],
+                                 params, ('deviceInfo',), {}, force),
+            self.get_device_node(device_id, ENDPOINT_LOG, LOG_URL_MAPPING[device_type],
+                                 params, (LOG_DATA_NODE_MAPPING[device_type],), [], force_log),
+            self.get_device_node(device_id, ENDPOINT_WIFI, WIFI_INFO_URL_MAPPING[device_type],
+                                 params, ('wifiInfo',), {}, force),
+        ]
+        if device_type in CAT_STATISTIC_MAPPING:
+            cat_data_params = {
+                'deviceId': device_id,
+                'pageNumber': 1,
+                'pageSize': 3
+            }
+            requests.append(
+                self.get_device_node(device_id, ENDPOINT_CAT_DATA, CAT_STATISTIC_MAPPING[device_type],
+                                     cat_data_params, ('catInfo', 'singleData'), [], force)
+            )
+        detail_data, event_data, wifi_info_data, *cat_data = await asyncio.gather(*requests)
+        if (device_id, ENDPOINT_DETAIL) not in self._payloads:
+            # The detail fell back to its default, a snapshot built on it would report a blank device.
+            return None
+
+        if device_type == 'PURE3':
+            return WaterFountain(id=device_id,
+                                 device_attrs=device,
+                                 device_detail=detail_data,
+                                 event_record=event_data,
+                                 wifi_info=wifi_info_data,
+                                 cat_data=cat_data[0] if cat_data else [],
+                                 device_type=device_type)
+        if device_type == 'FEEDER':
+            return Feeder(id=device_id,
+                          device_attrs=device,
+                          device_detail=detail_data,
+                          event_record=event_data,
+                          wifi_info=wifi_info_data,
+                          type=device_type)
+        if device_type == 'SCOOPER':
+            return LitterBox(id=device_id,
+                             device_attrs=device,
                              device_detail=detail_data,
                              event_record=event_data,
                              wifi_info=wifi_info_data,
-                             cat_data=fountain_cat_data,
-                             device_type=device_type)
+                             type=device_type)
+        return None
+
+    async def get_device_node(self, device_id, endpoint: str, api: str, params: dict, node: tuple, default,
+                              force: bool = False):
+        """Return a node of a device endpoint, reusing the last payload until its tier is due.
+
+        A failed request keeps the previous payload, or ``default`` when there is none.
+        """
+
+        cached = self._payloads.get((device_id, endpoint))
+        interval = self.refresh_intervals.get(endpoint, 0)
+        if cached and not force and time.monotonic() - cached[0] < interval:
+            return cached[1]
+
+        try:
+            response = await self.request(api, params, endpoint=endpoint)
+        except PollBudgetExhausted as error:
+            _LOGGER.debug('Kept the last %s of device %s: %s', endpoint, device_id, error)
+            return cached[1] if cached else default
+        try:
+            if 'data' not in response:
+                raise ValueError('no data in response')
+            data = response['data']
+            for key in node:
+                data = data.get(key) or {}
+        except (TypeError, ValueError, AttributeError):
+            _LOGGER.error('Got %s of device %s failed: %s', endpoint, device_id, response)
+            if endpoint == ENDPOINT_DETAIL and self.poll_planner is not None:
+                self.poll_planner.record_failure(device_id)
+            return cached[1] if cached else default
+        data = data or default
+        self._payloads[(device_id, endpoint)] = (time.monotonic(), data)
+        return data
@@ -0,0 +1,62 @@
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Fail fast while the Catlink cloud keeps failing.
+
+    The breaker opens after ``failure_threshold`` consecutive failures. Once
+    ``reset_timeout`` seconds have passed, a single probe request is let
+    through; its outcome closes the breaker again or re-opens it. A probe
+    that has not reported back within ``reset_timeout`` is given up and
+    another one is let through.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name: str = name
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.state: str = STATE_CLOSED
+        self.failures: int = 0
+        self.opened_at: float = 0
+        self.probe_started_at: float = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently rejected without a probe being due."""
+        return self.state == STATE_OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow_request(self) -> bool:
+        if self.state == STATE_CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == STATE_OPEN and now - self.opened_at >= self.reset_timeout:
+            _LOGGER.info('Circuit %s half open, probing', self.name)
+            self.state = STATE_HALF_OPEN
+            self.probe_started_at = now
+            return True
+        if self.state == STATE_HALF_OPEN and now - self.probe_started_at >= self.reset_timeout:
+            _LOGGER.info('Circuit %s probe did not report back, probing again', self.name)
+            self.probe_started_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.state != STATE_CLOSED:
+            _LOGGER.info('Circuit %s closed', self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != STATE_OPEN:
+                _LOGGER.warning('Circuit %s opened after %s failures', self.name, self.failures)
+            self.state = STATE_OPEN
+            self.opened_at = time.monotonic()
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _QueuedCommand:
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class CommandLane:
+    """Serialize the writes sent to one device.
+
+    Writes keyed by the device field they change are deduplicated: a write
+    whose value equals the value being sent or the current value is dropped,
+    and a newer write replaces a queued one for the same field. Unkeyed
+    writes are only serialized.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self._lock = asyncio.Lock()
+        self._queued: dict[str, _QueuedCommand] = {}
+        self._sending: dict[str, Any] = {}
+
+    @staticmethod
+    def same(value: Any, other: Any) -> bool:
+        return str(value) == str(other)
+
+    async def submit(self, send: Callable[[], Awaitable[dict]], key: str | None = None,
+                     value: Any = None, current: Callable[[], Any] | None = None) -> dict | None:
+        """Send a write once the lane is free; returns None if it was dropped or superseded."""
+
+        command = None
+        if key is not None:
+            queued = self._queued.pop(key, None)
+            if queued is not None:
+                if self.same(queued.value, value):
+                    self._queued[key] = queued
+                    _LOGGER.debug('Dropped %s=%s for %s, already queued', key, value, self.name)
+                    return None
+                _LOGGER.debug('Superseded %s=%s for %s by %s', key, queued.value, self.name, value)
+            target = self._sending[key] if key in self._sending else (current() if current else None)
+            if self.same(target, value):
+                _LOGGER.debug('Dropped %s=%s for %s, device already there', key, value, self.name)
+                return None
+            command = self._queued[key] = _QueuedCommand(value)
+
+        async with self._lock:
+            if key is not None:
+                if self._queued.get(key) is not command:
+                    return None
+                del self._queued[key]
+                self._sending[key] = value
+            try:
+                return await send()
+            finally:
+                if key is not None:
+                    self._sending.pop(key, None)
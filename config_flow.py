@@ -12,8 +12,18 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .exceptions import AuthError
-from .const import DOMAIN, POLLING_INTERVAL, CONF_PHONE
+from .exceptions import AuthError, CircuitOpenError
+from .const import (
+    DOMAIN, POLLING_INTERVAL, CONF_PHONE,
+    CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY,
+    CONF_DEVICE_CACHE_TTL, DEFAULT_DEVICE_CACHE_TTL,
+    DEFAULT_REFRESH_INTERVALS, REFRESH_INTERVAL_OPTIONS,
+    CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT, CONF_RATE_BURST, DEFAULT_RATE_BURST,
+    CONF_COMMAND_REFRESH_DELAY, DEFAULT_COMMAND_REFRESH_DELAY,
+    CONF_FOOD_OUT_WINDOW, DEFAULT_FOOD_OUT_WINDOW,
+    CONF_ACTIVE_POLL_INTERVAL, DEFAULT_ACTIVE_POLL_INTERVAL, CONF_IDLE_POLL_INTERVAL, DEFAULT_IDLE_POLL_INTERVAL,
+    CONF_PER_DEVICE_COORDINATORS, DEFAULT_PER_DEVICE_COORDINATORS, CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS,
+)
 from .api_validate_util import NoDevicesError, async_validate_api
 
 
@@ -61,7 +71,7 @@ class CatlinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 await async_validate_api(self.hass, phone, password)
             except AuthError:
                 errors["base"] = "invalid_auth"
-            except ConnectionError:
+            except (ConnectionError, CircuitOpenError):
                 errors["base"] = "cannot_connect"
             except NoDevicesError:
                 errors["base"] = "no_devices"
@@ -76,7 +86,7 @@ class CatlinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_PASSWORD: password,
                     },
                     options={
-                        POLLING_INTERVAL: self.entry.options[POLLING_INTERVAL],
+                        **self.entry.options,
                     }
                 )
 
@@ -105,7 +115,7 @@ class CatlinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 await async_validate_api(self.hass, phone, password)
             except AuthError:
                 errors["base"] = "invalid_auth"
-            except ConnectionError:
+            except (ConnectionError, CircuitOpenError):
                 errors["base"] = "cannot_connect"
             except NoDevicesError:
                 errors["base"] = "no_devices"
@@ -121,6 +131,20 @@ class CatlinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     },
                     options={
                         POLLING_INTERVAL: 10,
+                        CONF_MAX_CONCURRENCY: DEFAULT_MAX_CONCURRENCY,
+                        CONF_DEVICE_CACHE_TTL: DEFAULT_DEVICE_CACHE_TTL,
+                        CONF_RATE_LIMIT: DEFAULT_RATE_LIMIT,
+                        CONF_RATE_BURST: DEFAULT_RATE_BURST,
+                        CONF_COMMAND_REFRESH_DELAY: DEFAULT_COMMAND_REFRESH_DELAY,
+                        CONF_FOOD_OUT_WINDOW: DEFAULT_FOOD_OUT_WINDOW,
+                        CONF_ACTIVE_POLL_INTERVAL: DEFAULT_ACTIVE_POLL_INTERVAL,
+                        CONF_IDLE_POLL_INTERVAL: DEFAULT_IDLE_POLL_INTERVAL,
+                        CONF_PER_DEVICE_COORDINATORS: DEFAULT_PER_DEVICE_COORDINATORS,
+                        CONF_POLL_SHARDS: DEFAULT_POLL_SHARDS,
+                        **{
+                            option: DEFAULT_REFRESH_INTERVALS[endpoint]
+                            for endpoint, option in REFRESH_INTERVAL_OPTIONS.items()
+                        },
                     }
                 )
 
@@ -154,6 +178,73 @@ class CatlinkOptionsFlowHandler(config_entries.OptionsFlow):
                     POLLING_INTERVAL, 120
                 ),
             ): int,
+            vol.Required(
+                CONF_ACTIVE_POLL_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_ACTIVE_POLL_INTERVAL, DEFAULT_ACTIVE_POLL_INTERVAL
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Required(
+                CONF_IDLE_POLL_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_IDLE_POLL_INTERVAL, DEFAULT_IDLE_POLL_INTERVAL
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Required(
+                CONF_PER_DEVICE_COORDINATORS,
+                default=self.config_entry.options.get(
+                    CONF_PER_DEVICE_COORDINATORS, DEFAULT_PER_DEVICE_COORDINATORS
+                ),
+            ): bool,
+            vol.Required(
+                CONF_POLL_SHARDS,
+                default=self.config_entry.options.get(
+                    CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Required(
+                CONF_MAX_CONCURRENCY,
+                default=self.config_entry.options.get(
+                    CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Required(
+                CONF_DEVICE_CACHE_TTL,
+                default=self.config_entry.options.get(
+                    CONF_DEVICE_CACHE_TTL, DEFAULT_DEVICE_CACHE_TTL
+                ),
+            ): vol.All(int, vol.Range(min=0)),
+            vol.Required(
+                CONF_RATE_LIMIT,
+                default=self.config_entry.options.get(
+                    CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+            vol.Required(
+                CONF_RATE_BURST,
+                default=self.config_entry.options.get(
+                    CONF_RATE_BURST, DEFAULT_RATE_BURST
+                ),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Required(
+                CONF_COMMAND_REFRESH_DELAY,
+                default=self.config_entry.options.get(
+                    CONF_COMMAND_REFRESH_DELAY, DEFAULT_COMMAND_REFRESH_DELAY
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_FOOD_OUT_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_FOOD_OUT_WINDOW, DEFAULT_FOOD_OUT_WINDOW
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
         }
+        for endpoint, option in REFRESH_INTERVAL_OPTIONS.items():
+            options[vol.Required(
+                option,
+                default=self.config_entry.options.get(
+                    option, DEFAULT_REFRESH_INTERVALS[endpoint]
+                ),
+            )] = vol.All(int, vol.Range(min=0))
 
         return self.async_show_form(step_id="catlink_options", data_schema=vol.Schema(options))
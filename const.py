@@ -8,8 +8,27 @@ CONF_PHONE = 'phone'
 CONF_PHONE_IAC = 'phone_iac'
 CONF_LANGUAGE = 'language'
 POLLING_INTERVAL = "polling_interval"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_DEVICE_CACHE_TTL = "device_cache_ttl"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_BURST = "rate_burst"
+CONF_COMMAND_REFRESH_DELAY = "command_refresh_delay"
+CONF_FOOD_OUT_WINDOW = "food_out_window"
+CONF_ACTIVE_POLL_INTERVAL = "active_polling_interval"
+CONF_IDLE_POLL_INTERVAL = "idle_polling_interval"
+CONF_PER_DEVICE_COORDINATORS = "per_device_coordinators"
+CONF_POLL_SHARDS = "poll_shards"
+CONF_LOG_INTERVAL = "log_interval"
+CONF_WIFI_INTERVAL = "wifi_interval"
+CONF_CAT_DATA_INTERVAL = "cat_data_interval"
 CATLINK_COORDINATOR = "catlink_coordinator"
 UPDATE_LISTENER = "update_listener"
+RATE_LIMITERS = "rate_limiters"
+ACCOUNT_SCHEDULER = "account_scheduler"
+SHARED_DEVICES = "shared_devices"
+SERVICE_RESCAN_DEVICES = "rescan_devices"
+SERVICE_DISPENSE = "dispense"
+ATTR_PORTIONS = "portions"
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
@@ -25,6 +44,45 @@ PLATFORMS = [
 
 
 TIMEOUT = 5 * 60
+REQUEST_TIMEOUT = 60
+# Share of the polling interval a poll may spend before unfinished devices keep their last data.
+POLL_BUDGET_RATIO = 0.8
+# Bounds in seconds of the per-device poll interval: busy devices use the active one,
+# idle devices back off from the polling interval up to the idle one.
+DEFAULT_ACTIVE_POLL_INTERVAL = 5
+DEFAULT_IDLE_POLL_INTERVAL = 10 * 60
+DEFAULT_PER_DEVICE_COORDINATORS = False
+# Slices the devices of an account are polled in, one per polling interval / shards; 1 polls all at once.
+DEFAULT_POLL_SHARDS = 1
+# Account polls in flight at once across all entries, and seconds between the poll phases of the accounts.
+ACCOUNT_POLL_LIMIT = 2
+ACCOUNT_PHASE_STEP = 7
+SCOOPER_WORKING_STATUS = '01'
+FEEDER_FOOD_OUTING_STATUS = 'FOOD_OUTING'
+# Consecutive failed polls after which a device is quarantined and only probed at the idle interval.
+QUARANTINE_FAILURES = 5
+DEFAULT_POLL_BUDGET = 30
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_DEVICE_CACHE_TTL = 60 * 60
+AUTH_SAVE_DELAY = 10
+DEFAULT_COMMAND_REFRESH_DELAY = 5
+# Seconds between detail checks while waiting for a command to show up on the device, the last delay repeats.
+COMMAND_WATCH_DELAYS = (1, 1, 2, 3, 5, 8)
+COMMAND_WATCH_TIMEOUT = 90
+# Seconds during which feeder food out presses are summed into a single dispense.
+DEFAULT_FOOD_OUT_WINDOW = 3
+FEEDER_FOOD_OUT_MIN = 1
+FEEDER_FOOD_OUT_MAX = 10
+# Settings kept only in Home Assistant, per device, and restored across restarts.
+LOCAL_FOOD_OUT_NUM = "food_out_num"
+LOCAL_NIGHT_MODE_START = "night_mode_start"
+LOCAL_NIGHT_MODE_END = "night_mode_end"
+DEFAULT_FOOD_OUT_NUM = 1
+DEFAULT_SCOOPER_NIGHT_MODE_START = "00:00"
+DEFAULT_SCOOPER_NIGHT_MODE_END = "23:00"
+# Requests per second and burst size shared by all accounts on the same API base.
+DEFAULT_RATE_LIMIT = 5
+DEFAULT_RATE_BURST = 20
 SIGN_KEY = '00109190907746a7ad0e2139b6d09ce47551770157fe4ac5922f3a5454c82712'
 RSA_PUBLIC_KEY = 'MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQCCA9I+iEl2AI8dnhdwwxPxHVK8iNAt6aTq6UhNsLsguWS5qtbLnuGz2RQdfNS' \
                  'aKSU2B6D/vE2gb1fM6f1A5cKndqF/riWGWn1EfL3FFQZduOTxoA0RTQzhrTa5LHcJ/an/NuHUwShwIOij0Mf4g8faTe4FT7/HdA' \
@@ -40,6 +98,45 @@ RSA_PRIVATE_KEY = 'MIICdgIBADANBgkqhkiG9w0BAQEFAASCAmAwggJcAgEAAoGBAIID0j6ISXYAj
                   'I0eGQrD/W4rBeoCX8sJDCH49lMsec52TFI2Gn8tTKOCqqgGvRSKDJ005HlnmKw=='
 DEFAULT_API_BASE = 'https://app.catlinks.cn/api/'
 
+DEVICE_SOURCE = 'source'
+DEVICE_SOURCE_OWN = 'own'
+DEVICE_SOURCE_SHARED = 'shared'
+
+ENDPOINT_DEVICES = 'devices'
+ENDPOINT_DETAIL = 'detail'
+ENDPOINT_LOG = 'log'
+ENDPOINT_WIFI = 'wifi'
+ENDPOINT_CAT_DATA = 'cat_data'
+
+# Seconds between two fetches of an endpoint, 0 means every poll.
+DEFAULT_REFRESH_INTERVALS = {
+    ENDPOINT_DETAIL: 0,
+    ENDPOINT_LOG: 60,
+    ENDPOINT_WIFI: 10 * 60,
+    ENDPOINT_CAT_DATA: 10 * 60,
+}
+
+# Options flow key of the refresh interval of each endpoint.
+REFRESH_INTERVAL_OPTIONS = {
+    ENDPOINT_LOG: CONF_LOG_INTERVAL,
+    ENDPOINT_WIFI: CONF_WIFI_INTERVAL,
+    ENDPOINT_CAT_DATA: CONF_CAT_DATA_INTERVAL,
+}
+
+# Retries of idempotent GET requests: attempts in total and exponential backoff bounds in seconds.
+NO_RETRY_POLICY = {'attempts': 1, 'base_delay': 0, 'max_delay': 0}
+DEFAULT_RETRY_POLICY = {'attempts': 3, 'base_delay': 0.5, 'max_delay': 4}
+RETRY_POLICIES = {
+    ENDPOINT_DEVICES: {'attempts': 3, 'base_delay': 1, 'max_delay': 8},
+    ENDPOINT_DETAIL: {'attempts': 3, 'base_delay': 0.5, 'max_delay': 4},
+    ENDPOINT_LOG: {'attempts': 2, 'base_delay': 0.5, 'max_delay': 2},
+    ENDPOINT_WIFI: {'attempts': 2, 'base_delay': 0.5, 'max_delay': 2},
+    ENDPOINT_CAT_DATA: {'attempts': 2, 'base_delay': 0.5, 'max_delay': 2},
+}
+
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 60
+
 DETAIL_URL_MAPPING = {
     'PURE3': 'token/device/purepro/pure3/detail',
     'FEEDER': 'token/device/feeder/detail',
@@ -1,17 +1,36 @@
+import asyncio
 import logging
+import time
+from dataclasses import replace
+from collections.abc import Awaitable, Callable
 from datetime import timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_DEVICES
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .catlink_client import CatlinkClient
-from .const import CONF_PHONE, TIMEOUT, DOMAIN, POLLING_INTERVAL
-from .data_model import CatlinkData
-from .exceptions import AuthError
+from .command_lane import CommandLane
+from .const import (
+    CONF_PHONE, TIMEOUT, DOMAIN, POLLING_INTERVAL,
+    CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY,
+    CONF_DEVICE_CACHE_TTL, DEFAULT_DEVICE_CACHE_TTL, REFRESH_INTERVAL_OPTIONS, POLL_BUDGET_RATIO,
+    CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT, CONF_RATE_BURST, DEFAULT_RATE_BURST, DEFAULT_API_BASE,
+    CONF_COMMAND_REFRESH_DELAY, DEFAULT_COMMAND_REFRESH_DELAY, COMMAND_WATCH_DELAYS, COMMAND_WATCH_TIMEOUT,
+    CONF_FOOD_OUT_WINDOW, DEFAULT_FOOD_OUT_WINDOW,
+    CONF_ACTIVE_POLL_INTERVAL, DEFAULT_ACTIVE_POLL_INTERVAL, CONF_IDLE_POLL_INTERVAL, DEFAULT_IDLE_POLL_INTERVAL,
+    CONF_PER_DEVICE_COORDINATORS, DEFAULT_PER_DEVICE_COORDINATORS, CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS,
+)
+from .data_model import CatlinkData, Feeder, LitterBox, WaterFountain
+from .exceptions import AuthError, CircuitOpenError, PollBudgetExhausted
+from .poll_planner import AdaptivePollPlanner
+from .rate_limiter import async_get_rate_limiter
+from .scheduler import async_get_account_scheduler
+from .shared_devices import async_get_shared_devices
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,7 +45,30 @@ class CatlinkDevicesCoordinator(DataUpdateCoordinator):
             entry.data[CONF_PASSWORD],
             session=async_get_clientsession(hass),
             timeout=TIMEOUT,
+            hass=hass,
+            max_concurrency=entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            device_cache_ttl=entry.options.get(CONF_DEVICE_CACHE_TTL, DEFAULT_DEVICE_CACHE_TTL),
+            refresh_intervals={
+                endpoint: entry.options[option]
+                for endpoint, option in REFRESH_INTERVAL_OPTIONS.items()
+                if option in entry.options
+            },
+            poll_budget=entry.options[POLLING_INTERVAL] * POLL_BUDGET_RATIO,
+            rate_limiter=async_get_rate_limiter(hass, DEFAULT_API_BASE),
+            poll_planner=AdaptivePollPlanner(
+                entry.options.get(CONF_ACTIVE_POLL_INTERVAL, DEFAULT_ACTIVE_POLL_INTERVAL),
+                entry.options[POLLING_INTERVAL],
+                entry.options.get(CONF_IDLE_POLL_INTERVAL, DEFAULT_IDLE_POLL_INTERVAL),
+                shards=entry.options.get(CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS),
+            ),
+            shared_devices=async_get_shared_devices(hass),
         )
+        self.client.rate_limiter.configure(
+            entry.entry_id,
+            entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+        )
+        self.entry = entry
         super().__init__(
             hass,
             _LOGGER,
@@ -34,14 +76,330 @@ class CatlinkDevicesCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=entry.options[POLLING_INTERVAL]),
         )
         self._subs = {}
+        self.command_refresh_delay: float = entry.options.get(
+            CONF_COMMAND_REFRESH_DELAY, DEFAULT_COMMAND_REFRESH_DELAY)
+        self._command_tasks: set[asyncio.Task] = set()
+        self._watches: dict[int, dict[str, Any]] = {}
+        self._lanes: dict[int, CommandLane] = {}
+        self.food_out_window: float = entry.options.get(CONF_FOOD_OUT_WINDOW, DEFAULT_FOOD_OUT_WINDOW)
+        self._accumulated: dict[tuple, int] = {}
+        self._local_settings: dict[int, dict[str, Any]] = {}
+        self.per_device: bool = entry.options.get(CONF_PER_DEVICE_COORDINATORS, DEFAULT_PER_DEVICE_COORDINATORS)
+        self.children: dict[int, CatlinkDeviceCoordinator] = {}
+        # Interval the next poll is scheduled at, bounding its budget so it never overruns it.
+        self.poll_interval: float = entry.options[POLLING_INTERVAL]
+        self.account_scheduler = async_get_account_scheduler(hass)
+        self.phase: float = self.account_scheduler.register(entry.entry_id, entry.options[POLLING_INTERVAL])
+        self.client.shared_devices.listen(self.client.phone, self.async_push_device)
 
     async def _async_update_data(self) -> CatlinkData:
         """Fetch data from Catlink."""
 
+        budget = self.poll_interval * POLL_BUDGET_RATIO
+        deadline = time.monotonic() + budget
         try:
-            data = await self.client.get_catlink_data(self.hass)
+            # The wait for a slot counts against the budget, except for the first poll that has to list the devices.
+            async with self.account_scheduler.slot(budget if self.data is not None else None):
+                data = await self.client.get_catlink_data(
+                    self.hass, poll_devices=not self.per_device, budget=max(deadline - time.monotonic(), 0))
             _LOGGER.debug(f'Found the following Catlink devices/pets: {data}')
+        except PollBudgetExhausted as error:
+            _LOGGER.debug('Skipped a poll of %s: %s', self.client.phone, error)
+            return self.data
         except AuthError as error:
             raise ConfigEntryAuthFailed(error) from error
+        except CircuitOpenError as error:
+            if self.data is None:
+                raise UpdateFailed(error) from error
+            _LOGGER.debug('Serving stale Catlink data of %s: %s', self.client.phone, error)
+            return replace(self.data, stale=True)
         else:
+            interval = self.entry.options[POLLING_INTERVAL]
+            if not self.per_device:
+                # Wake up when the next device or slice is due rather than at a fixed interval.
+                interval = self.client.poll_planner.next_interval()
+            self.poll_interval = interval
+            if self.data is None:
+                # Shift the account off the others once so their polls do not line up.
+                interval += self.phase
+            self.update_interval = timedelta(seconds=interval)
             return data
+
+    @callback
+    def async_setup_children(self) -> None:
+        """Start a coordinator for every device when devices are polled on their own."""
+
+        if not self.per_device:
+            return
+        for device_id in self.device_ids(self.data):
+            child = self.children[device_id] = CatlinkDeviceCoordinator(self, device_id)
+            child.async_set_device(self.get_device(device_id))
+
+    def device_coordinator(self, device_id) -> 'CatlinkDevicesCoordinator | CatlinkDeviceCoordinator':
+        """Return the coordinator the entities of a device listen to."""
+        return self.children.get(device_id, self)
+
+    async def async_send_command(self, device_id, api: str, params: dict,
+                                 field: str | None = None, value: Any = None) -> dict | None:
+        """Send a write through the command lane of its device.
+
+        ``field`` and ``value`` describe the detail field the write changes;
+        they let the lane drop writes the device already reflects. Returns
+        None when the write was dropped or superseded by a newer one.
+        """
+
+        lane = self._lanes.get(device_id)
+        if lane is None:
+            lane = self._lanes[device_id] = CommandLane(f'{self.client.phone}-{device_id}')
+
+        def current():
+            device_data = self.get_device(device_id)
+            return device_data.device_detail.get(field) if device_data else None
+
+        return await lane.submit(lambda: self.client.request(api, params, 'POST'), field, value, current)
+
+    def get_local_setting(self, device_id, key: str, default: Any = None) -> Any:
+        """Return a setting that only lives in Home Assistant, never on the cloud."""
+
+        return self._local_settings.get(device_id, {}).get(key, default)
+
+    @callback
+    def async_set_local_setting(self, device_id, key: str, value: Any) -> None:
+        self._local_settings.setdefault(device_id, {})[key] = value
+
+    @callback
+    def async_accumulate(self, device_id, key: str, amount: int,
+                         send: Callable[[int], Awaitable[None]]) -> None:
+        """Sum amounts queued for a device within the food out window and send them once."""
+
+        pending = self._accumulated.get((device_id, key))
+        self._accumulated[(device_id, key)] = (pending or 0) + amount
+        if pending is not None:
+            return
+        self._async_track_command_task(
+            self._async_send_accumulated(device_id, key, send), f'{self.name}-{key}-{device_id}')
+
+    async def _async_send_accumulated(self, device_id, key: str, send: Callable[[int], Awaitable[None]]) -> None:
+        try:
+            await asyncio.sleep(self.food_out_window)
+        finally:
+            amount = self._accumulated.pop((device_id, key))
+        try:
+            await send(amount)
+        except CircuitOpenError as error:
+            _LOGGER.warning('Dropped %s of %s for device %s: %s', key, amount, device_id, error)
+
+    @callback
+    def _async_track_command_task(self, target: Awaitable, name: str) -> None:
+        task = self.entry.async_create_background_task(self.hass, target, name)
+        self._command_tasks.add(task)
+        task.add_done_callback(self._command_tasks.discard)
+
+    @callback
+    def async_confirm_command(self, device_id, expected: dict[str, Any] | None = None) -> None:
+        """Confirm an acknowledged command in the background by watching its device.
+
+        The calling service returns right away. Only the detail endpoint of the
+        device is polled, on a short backoff schedule, until it reports the
+        ``expected`` values or the watch deadline passes. Commands to a device
+        that is already watched join that watch.
+        """
+        if device_id in self._watches:
+            self._watches[device_id].update(expected or {})
+            return
+        self._watches[device_id] = dict(expected or {})
+        self._async_track_command_task(self._async_watch_command(device_id), f'{self.name}-watch-{device_id}')
+
+    async def _async_watch_command(self, device_id) -> None:
+        deadline = time.monotonic() + COMMAND_WATCH_TIMEOUT
+        delays = iter(COMMAND_WATCH_DELAYS)
+        try:
+            while True:
+                expected = self._watches[device_id]
+                if not expected:
+                    # Nothing observable to wait for, refresh the whole device once.
+                    await asyncio.sleep(self.command_refresh_delay)
+                    if self._watches[device_id]:
+                        continue
+                    await self.async_refresh_device(device_id)
+                    return
+                await asyncio.sleep(next(delays, COMMAND_WATCH_DELAYS[-1]))
+                device_data = await self.client.refresh_device_detail(device_id)
+                if device_data is None:
+                    return
+                detail = device_data.device_detail
+                if all(str(detail.get(key)) == str(value) for key, value in expected.items()):
+                    break
+                if time.monotonic() >= deadline:
+                    _LOGGER.debug('Device %s did not report %s in time, got %s', device_id, expected, detail)
+                    break
+        except CircuitOpenError as error:
+            _LOGGER.debug('Stopped watching device %s: %s', device_id, error)
+            return
+        finally:
+            self._watches.pop(device_id, None)
+        if device_data is not None:
+            self.async_push_device(device_data)
+
+    async def async_refresh_device(self, device_id, force: bool = True) -> None:
+        """Refresh a single device and push it to listeners without polling the account."""
+
+        try:
+            device_data = await self.client.refresh_device(device_id, force)
+        except CircuitOpenError as error:
+            _LOGGER.debug('Skipped refreshing device %s: %s', device_id, error)
+            return
+        if device_data is not None:
+            self.async_push_device(device_data)
+
+    def get_devices(self, device_data: Feeder | LitterBox | WaterFountain) -> dict[int, Any] | None:
+        """Return the dict of the current data holding devices of the same kind."""
+        if self.data is None:
+            return None
+        if isinstance(device_data, WaterFountain):
+            return self.data.water_fountains
+        if isinstance(device_data, Feeder):
+            return self.data.feeders
+        return self.data.litter_boxes
+
+    def get_device(self, device_id) -> Feeder | LitterBox | WaterFountain | None:
+        if self.data is None:
+            return None
+        for devices in (self.data.feeders, self.data.litter_boxes, self.data.water_fountains):
+            if devices and device_id in devices:
+                return devices[device_id]
+        return None
+
+    @callback
+    def async_push_device(self, device_data: Feeder | LitterBox | WaterFountain) -> None:
+        """Replace one device in the current data and notify listeners.
+
+        The refresh timer is left alone so pushes never postpone the account poll.
+        """
+
+        devices = self.get_devices(device_data)
+        if devices is None or device_data.id not in devices:
+            return
+        devices[device_data.id] = device_data
+        if child := self.children.get(device_data.id):
+            child.async_set_device(device_data)
+            return
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending command confirmations and children along with the coordinator."""
+        for task in list(self._command_tasks):
+            task.cancel()
+        for child in self.children.values():
+            await child.async_shutdown()
+        self.account_scheduler.unregister(self.entry.entry_id)
+        self.client.rate_limiter.release(self.entry.entry_id)
+        self.client.shared_devices.release(self.client.phone)
+        await super().async_shutdown()
+
+    async def async_rescan_devices(self) -> None:
+        """Re-list the account devices and reload the entry if the inventory changed."""
+
+        known_ids = self.device_ids(self.data)
+        self.client.invalidate_devices()
+        await self.async_refresh()
+        if self.last_update_success and self.device_ids(self.data) != known_ids:
+            _LOGGER.info('Catlink devices of %s changed, reloading', self.client.phone)
+            await self.hass.config_entries.async_reload(self.entry.entry_id)
+
+    @staticmethod
+    def device_ids(data: CatlinkData | None) -> set[int]:
+        if not data:
+            return set()
+        return {
+            *(data.feeders or {}),
+            *(data.litter_boxes or {}),
+            *(data.water_fountains or {}),
+        }
+
+
+class CatlinkDeviceCoordinator(DataUpdateCoordinator):
+    """Poll a single device on its own schedule under an account coordinator.
+
+    The account coordinator keeps auth, the inventory, commands and local
+    settings; this one only fetches its device, so a slow or failing device
+    delays and fails nothing but its own entities. Its data holds just that
+    device, shaped like the account data the entities read.
+    """
+
+    data: CatlinkData
+
+    def __init__(self, parent: CatlinkDevicesCoordinator, device_id) -> None:
+        self.parent = parent
+        self.device_id = device_id
+        self.poll_interval: float = parent.client.poll_planner.next_interval(device_id)
+        super().__init__(
+            parent.hass,
+            _LOGGER,
+            name=f'{parent.name}-{device_id}',
+            update_interval=timedelta(seconds=self.poll_interval),
+        )
+
+    @property
+    def client(self) -> CatlinkClient:
+        return self.parent.client
+
+    async def _async_update_data(self) -> CatlinkData:
+        """Fetch the device from Catlink."""
+
+        try:
+            device_data = await self.client.poll_single_device(
+                self.device_id, budget=self.poll_interval * POLL_BUDGET_RATIO)
+        except AuthError as error:
+            raise ConfigEntryAuthFailed(error) from error
+        except CircuitOpenError as error:
+            if self.data is None:
+                raise UpdateFailed(error) from error
+            return replace(self.data, stale=True)
+        except Exception as error:
+            raise UpdateFailed(f'Got data of device {self.device_id} failed: {error}') from error
+        finally:
+            self.poll_interval = self.client.poll_planner.next_interval(self.device_id)
+            self.update_interval = timedelta(seconds=self.poll_interval)
+        if device_data is None:
+            raise UpdateFailed(f'Got no data of device {self.device_id}, it may no longer be listed')
+        devices = self.parent.get_devices(device_data)
+        if devices is not None and self.device_id in devices:
+            devices[self.device_id] = device_data
+        return self.device_data(device_data)
+
+    def device_data(self, device_data: Feeder | LitterBox | WaterFountain) -> CatlinkData:
+        """Wrap the device into account data holding only this device."""
+        devices = {self.device_id: device_data}
+        return CatlinkData(
+            uid=self.client.phone,
+            water_fountains=devices if isinstance(device_data, WaterFountain) else {},
+            feeders=devices if isinstance(device_data, Feeder) else {},
+            litter_boxes=devices if isinstance(device_data, LitterBox) else {},
+        )
+
+    @callback
+    def async_set_device(self, device_data: Feeder | LitterBox | WaterFountain) -> None:
+        """Replace the device without touching the refresh timer and notify listeners."""
+        self.data = self.device_data(device_data)
+        self.async_update_listeners()
+
+    async def async_send_command(self, device_id, api: str, params: dict,
+                                 field: str | None = None, value: Any = None) -> dict | None:
+        return await self.parent.async_send_command(device_id, api, params, field, value)
+
+    @callback
+    def async_confirm_command(self, device_id, expected: dict[str, Any] | None = None) -> None:
+        self.parent.async_confirm_command(device_id, expected)
+
+    @callback
+    def async_accumulate(self, device_id, key: str, amount: int,
+                         send: Callable[[int], Awaitable[None]]) -> None:
+        self.parent.async_accumulate(device_id, key, amount, send)
+
+    def get_local_setting(self, device_id, key: str, default: Any = None) -> Any:
+        return self.parent.get_local_setting(device_id, key, default)
+
+    @callback
+    def async_set_local_setting(self, device_id, key: str, value: Any) -> None:
+        self.parent.async_set_local_setting(device_id, key, value)
@@ -9,6 +9,7 @@ class CatlinkData:
         litter_boxes:  Optional[dict[int, Any]] = None
         water_fountains: Optional[dict[int, Any]] = None
         pets: Optional[dict[int, Any]] = None
+        stale: bool = False
 
 
 @dataclass
@@ -23,3 +23,9 @@ class ServerError(Exception):
 
 class NoDevicesError(Exception):
     """ No Devices from Catlink API. """
+
+class CircuitOpenError(Exception):
+    """ Catlink API requests are rejected while the circuit breaker is open. """
+
+class PollBudgetExhausted(Exception):
+    """ The current poll ran out of its local time budget before a request could be sent. """
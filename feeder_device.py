@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import Any
 from datetime import time, datetime
@@ -12,6 +11,7 @@ from homeassistant.components.sensor import (
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.components.time import TimeEntity
 from homeassistant.const import EntityCategory
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .data_model import Feeder
@@ -730,13 +730,19 @@ class FeederWifiRssi(CoordinatorEntity, SensorEntity):
         return EntityCategory.DIAGNOSTIC
 
 
-class FeederManualFoodOutNumSelect(CoordinatorEntity, SelectEntity):
+class FeederManualFoodOutNumSelect(CoordinatorEntity, SelectEntity, RestoreEntity):
     """Representation of feeder status."""
-    food_out_num: int = 1
+
     def __init__(self, coordinator, feeder_id):
         super().__init__(coordinator)
         self.feeder_id = feeder_id
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state is not None and last_state.state in self.options:
+            self.coordinator.async_set_local_setting(self.feeder_id, LOCAL_FOOD_OUT_NUM, int(last_state.state))
+
     @property
     def feeder_data(self) -> Feeder:
         """Handle coordinator Feeder data."""
@@ -780,16 +786,15 @@ class FeederManualFoodOutNumSelect(CoordinatorEntity, SelectEntity):
 
     @property
     def current_option(self) -> str:
-        return str(self.food_out_num)
+        return str(self.coordinator.get_local_setting(self.feeder_id, LOCAL_FOOD_OUT_NUM, DEFAULT_FOOD_OUT_NUM))
 
     @property
     def options(self) -> list[str]:
         return list(map(str, range(1,11)))
 
     async def async_select_option(self, option: str) -> None:
-        self.food_out_num = int(option)
+        self.coordinator.async_set_local_setting(self.feeder_id, LOCAL_FOOD_OUT_NUM, int(option))
         self.async_write_ha_state()
-        await self.coordinator.async_request_refresh()
 
 
 class FeederFoodOutButton(CoordinatorEntity, ButtonEntity):
@@ -841,14 +846,29 @@ class FeederFoodOutButton(CoordinatorEntity, ButtonEntity):
         return 'mdi:bowl-mix'
 
     async def async_press(self) -> None:
+        await self.async_dispense()
+
+    async def async_dispense(self, portions: int | None = None) -> None:
+        """Queue portions to dispense; portions queued within the window go out as one food out."""
+        if portions is None:
+            portions = self.coordinator.get_local_setting(self.feeder_id, LOCAL_FOOD_OUT_NUM, DEFAULT_FOOD_OUT_NUM)
+        self.coordinator.async_accumulate(self.feeder_data.id, SERVICE_DISPENSE, portions, self._async_food_out)
+
+    async def _async_food_out(self, portions: int) -> None:
+        food_out_num = max(FEEDER_FOOD_OUT_MIN, min(FEEDER_FOOD_OUT_MAX, portions))
+        if food_out_num != portions:
+            _LOGGER.warning('Feeder %s can dispense %s to %s portions at once, clamped %s to %s',
+                            self.feeder_data.id, FEEDER_FOOD_OUT_MIN, FEEDER_FOOD_OUT_MAX, portions, food_out_num)
         api = 'token/device/feeder/foodOut'
         params = {
             'deviceId': self.feeder_data.id,
-            'footOutNum': FeederManualFoodOutNumSelect.food_out_num
+            'footOutNum': food_out_num
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.feeder_data.id, api, params)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.feeder_data.id)
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -910,12 +930,13 @@ class FeederAutoFillFoodSwitch(CoordinatorEntity, SwitchEntity):
             'deviceId': self.feeder_data.id,
             'enable': 1
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.feeder_data.id, api, params, 'newAutoFillStatus', True)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.feeder_data.device_detail['newAutoFillStatus'] = True
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.feeder_data.id, {'newAutoFillStatus': True})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -925,12 +946,13 @@ class FeederAutoFillFoodSwitch(CoordinatorEntity, SwitchEntity):
             'deviceId': self.feeder_data.id,
             'enable': 0
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.feeder_data.id, api, params, 'newAutoFillStatus', False)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.feeder_data.device_detail['newAutoFillStatus'] = False
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.feeder_data.id, {'newAutoFillStatus': False})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -994,12 +1016,13 @@ class FeederLockSwitch(CoordinatorEntity, SwitchEntity):
             'deviceId': self.feeder_data.id,
             'lockStatus': 1
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.feeder_data.id, api, params, 'keyLockStatus', True)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.feeder_data.device_detail['keyLockStatus'] = True
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.feeder_data.id, {'keyLockStatus': True})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1009,12 +1032,13 @@ class FeederLockSwitch(CoordinatorEntity, SwitchEntity):
             'deviceId': self.feeder_data.id,
             'lockStatus': 0
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.feeder_data.id, api, params, 'keyLockStatus', False)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.feeder_data.device_detail['keyLockStatus'] = False
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.feeder_data.id, {'keyLockStatus': False})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1088,12 +1112,15 @@ class FeederIndicatorLightSelect(CoordinatorEntity, SelectEntity):
             'deviceId': self.feeder_data.id,
             'status': selected_mode,
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(
+            self.feeder_data.id, api, params, 'indicatorLightStatus', FEEDER_LIGHT_MODE_OPTIONS_REV[selected_mode])
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.feeder_data.device_detail['indicatorLightStatus'] = FEEDER_LIGHT_MODE_OPTIONS_REV[selected_mode]
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(
+                self.feeder_data.id, {'indicatorLightStatus': FEEDER_LIGHT_MODE_OPTIONS_REV[selected_mode]})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
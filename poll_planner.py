@@ -0,0 +1,141 @@
+import time
+
+from .const import FEEDER_FOOD_OUTING_STATUS, SCOOPER_WORKING_STATUS, QUARANTINE_FAILURES
+from .data_model import Feeder, LitterBox, WaterFountain
+
+
+def is_active(previous: Feeder | LitterBox | WaterFountain | None,
+              current: Feeder | LitterBox | WaterFountain) -> bool:
+    """Tell whether a device is busy enough to need second-level freshness."""
+
+    detail = current.device_detail or {}
+    if isinstance(current, LitterBox):
+        return detail.get('workStatus') == SCOOPER_WORKING_STATUS
+    if isinstance(current, Feeder):
+        return detail.get('foodOutStatus') == FEEDER_FOOD_OUTING_STATUS
+    if isinstance(current, WaterFountain):
+        return previous is not None and last_drink_id(current) > last_drink_id(previous)
+    return False
+
+
+def last_drink_id(fountain: WaterFountain) -> int:
+    drinks = [int(event['id']) for event in fountain.event_record or [] if event.get('type') == 'DRINK']
+    return max(drinks, default=0)
+
+
+class AdaptivePollPlanner:
+    """Pick the next poll time of every device from its activity and health.
+
+    Active devices are polled every ``active_interval`` seconds. An idle or
+    offline device starts at ``base_interval`` and doubles its interval on
+    every poll up to ``idle_interval``; any activity drops it back to the
+    active one. A device whose detail request fails backs off the same way
+    per consecutive failure and is quarantined, probed at ``idle_interval``,
+    after ``quarantine_failures`` of them. Offline and failing devices are
+    degraded: only their detail endpoint is polled until they recover.
+
+    With ``shards`` above one the devices are split into that many slices
+    polled in turn, one per ``base_interval / shards``, so the requests of
+    an account spread over the polling interval instead of bursting at its
+    start. Active devices are polled whatever slice is current.
+    """
+
+    # Devices due within this many seconds are polled along with the current poll.
+    TOLERANCE = 1
+
+    def __init__(self, active_interval: float, base_interval: float, idle_interval: float,
+                 quarantine_failures: int = QUARANTINE_FAILURES, shards: int = 1) -> None:
+        self.active_interval: float = active_interval
+        self.base_interval: float = max(base_interval, active_interval)
+        self.idle_interval: float = max(idle_interval, self.base_interval)
+        self.quarantine_failures: int = quarantine_failures
+        self._intervals: dict[int, float] = {}
+        self._due: dict[int, float] = {}
+        self._failures: dict[int, int] = {}
+        self._failed: set[int] = set()
+        self._offline: set[int] = set()
+        self.shards: int = max(shards, 1)
+        self._shard = -1
+
+    def is_due(self, device_id) -> bool:
+        return self._due.get(device_id, 0) - time.monotonic() <= self.TOLERANCE
+
+    def is_busy(self, device_id) -> bool:
+        return self._intervals.get(device_id) == self.active_interval
+
+    @property
+    def shard_interval(self) -> float:
+        return self.base_interval / self.shards
+
+    def next_shard(self, device_ids) -> set[int]:
+        """Advance to the next slice and return the devices in it."""
+
+        self._shard = (self._shard + 1) % self.shards
+        return {device_id for position, device_id in enumerate(sorted(device_ids))
+                if position % self.shards == self._shard}
+
+    def is_degraded(self, device_id) -> bool:
+        """Tell whether only the detail endpoint of a device should be polled."""
+        return device_id in self._offline or device_id in self._failures
+
+    @property
+    def quarantined(self) -> list[int]:
+        return [device_id for device_id, failures in self._failures.items()
+                if failures >= self.quarantine_failures]
+
+    @property
+    def offline(self) -> list[int]:
+        return list(self._offline)
+
+    def record_failure(self, device_id) -> float:
+        """Back a device off after a failed poll and return its next poll interval."""
+
+        failures = self._failures[device_id] = self._failures.get(device_id, 0) + 1
+        self._failed.add(device_id)
+        if failures >= self.quarantine_failures:
+            interval = self.idle_interval
+        else:
+            interval = min(self.base_interval * 2 ** (failures - 1), self.idle_interval)
+        self._intervals[device_id] = interval
+        self._due[device_id] = time.monotonic() + interval
+        return interval
+
+    def schedule(self, previous: Feeder | LitterBox | WaterFountain | None,
+                 current: Feeder | LitterBox | WaterFountain) -> float:
+        """Record a fresh snapshot of a device and return its next poll interval."""
+
+        if current.id in self._failed:
+            # The snapshot was patched from the last good payloads, keep the failure backoff.
+            self._failed.discard(current.id)
+            return self._intervals[current.id]
+        self._failures.pop(current.id, None)
+        if (current.device_detail or {}).get('online', True):
+            self._offline.discard(current.id)
+        else:
+            self._offline.add(current.id)
+
+        if current.id not in self._offline and is_active(previous, current):
+            interval = self.active_interval
+        elif current.id in self._intervals:
+            interval = min(max(self._intervals[current.id] * 2, self.base_interval), self.idle_interval)
+        else:
+            interval = self.base_interval
+        self._intervals[current.id] = interval
+        self._due[current.id] = time.monotonic() + interval
+        return interval
+
+    def next_interval(self, device_id=None) -> float:
+        """Seconds until the next device, or ``device_id``, is due, within the configured bounds."""
+
+        if device_id is None and self.shards > 1:
+            if any(self.is_busy(busy_id) for busy_id in self._intervals):
+                return min(self.active_interval, self.shard_interval)
+            return self.shard_interval
+        due = min(self._due.values(), default=None) if device_id is None else self._due.get(device_id)
+        if due is None:
+            return self.base_interval
+        remaining = due - time.monotonic()
+        return min(max(remaining, self.active_interval), self.idle_interval)
+
+    def intervals(self) -> dict[int, float]:
+        return dict(self._intervals)
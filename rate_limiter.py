@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, RATE_LIMITERS, DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST
+from .scheduler import PrioritySemaphore, PRIORITY_POLL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket limiting the rate of outbound Catlink API requests.
+
+    Up to ``capacity`` requests may burst, after which requests are let through
+    at ``rate`` per second, lowest priority value first and in arrival order
+    within a priority.
+
+    Every config entry sharing the bucket registers its own rate and burst;
+    the strictest of them applies.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate: float = rate
+        self.capacity: int = capacity
+        self.tokens: float = capacity
+        self.updated_at: float = time.monotonic()
+        self.throttled_time: float = 0
+        self.throttled_requests: int = 0
+        self._gate = PrioritySemaphore(1)
+        self._limits: dict[str, tuple[float, int]] = {}
+        self._defaults: tuple[float, int] = (rate, capacity)
+
+    def configure(self, entry_id: str, rate: float, capacity: int) -> None:
+        """Register the limits of a config entry and apply the strictest registered ones."""
+        self._limits[entry_id] = (rate, capacity)
+        self._apply()
+
+    def release(self, entry_id: str) -> None:
+        self._limits.pop(entry_id, None)
+        self._apply()
+
+    def _apply(self) -> None:
+        self._refill()
+        limits = self._limits.values() or [self._defaults]
+        self.rate = min(rate for rate, _ in limits)
+        self.capacity = min(capacity for _, capacity in limits)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    @property
+    def level(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self.tokens
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        async with self._gate.slot(priority):
+            self._refill()
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                self.throttled_time += wait
+                self.throttled_requests += 1
+                _LOGGER.debug('Throttling Catlink API request for %.2fs', wait)
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+
+
+def async_get_rate_limiter(hass: HomeAssistant, base_url: str) -> TokenBucket:
+    """Return the limiter shared by every config entry talking to ``base_url``.
+
+    A new limiter starts with the default limits until entries configure it.
+    """
+
+    limiters: dict[str, TokenBucket] = hass.data.setdefault(DOMAIN, {}).setdefault(RATE_LIMITERS, {})
+    limiter = limiters.get(base_url)
+    if limiter is None:
+        limiter = limiters[base_url] = TokenBucket(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
+    return limiter
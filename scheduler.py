@@ -0,0 +1,109 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, ACCOUNT_SCHEDULER, ACCOUNT_POLL_LIMIT, ACCOUNT_PHASE_STEP
+from .exceptions import PollBudgetExhausted
+
+# Lower values are served first.
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 10
+
+
+class PrioritySemaphore:
+    """Semaphore handing free slots to the waiter with the lowest priority value.
+
+    Waiters of equal priority are served in arrival order, so interactive
+    commands overtake queued poll requests without starving each other.
+    """
+
+    def __init__(self, value: int) -> None:
+        self._value: int = value
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(not waiter.done() for _, _, waiter in self._waiters)
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        if self._value > 0 and not self.waiting:
+            self._value -= 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._value += 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_POLL):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class AccountScheduler:
+    """Stagger the polls of the Catlink accounts and cap how many run at once.
+
+    Every account takes the lowest free position and is offset by
+    ``phase_step`` seconds per position, so accounts set up together do not
+    keep polling together. At most ``limit`` account polls, logins included,
+    are in flight across all entries. Per-device coordinators stay out of the
+    limit so a slow device never holds a slot other accounts wait for.
+    """
+
+    def __init__(self, limit: int, phase_step: float) -> None:
+        self.phase_step: float = phase_step
+        self._positions: dict[str, int] = {}
+        self._semaphore = asyncio.Semaphore(limit)
+
+    def register(self, entry_id: str, interval: float) -> float:
+        """Reserve a position for an account and return its phase offset within ``interval``."""
+
+        if entry_id not in self._positions:
+            taken = set(self._positions.values())
+            self._positions[entry_id] = next(position for position in itertools.count() if position not in taken)
+        return (self._positions[entry_id] * self.phase_step) % interval if interval else 0
+
+    def unregister(self, entry_id: str) -> None:
+        self._positions.pop(entry_id, None)
+
+    @asynccontextmanager
+    async def slot(self, timeout: float | None = None):
+        """Hold a poll slot, raising PollBudgetExhausted when none frees up within ``timeout`` seconds."""
+        try:
+            async with asyncio.timeout(timeout):
+                await self._semaphore.acquire()
+        except TimeoutError as exc:
+            raise PollBudgetExhausted('No account poll slot freed up within the poll budget') from exc
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+def async_get_account_scheduler(hass: HomeAssistant) -> AccountScheduler:
+    """Return the scheduler shared by every config entry."""
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if ACCOUNT_SCHEDULER not in domain_data:
+        domain_data[ACCOUNT_SCHEDULER] = AccountScheduler(ACCOUNT_POLL_LIMIT, ACCOUNT_PHASE_STEP)
+    return domain_data[ACCOUNT_SCHEDULER]
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import Any
 from datetime import time, datetime
@@ -12,11 +11,13 @@ from homeassistant.components.sensor import (
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.components.time import TimeEntity
 from homeassistant.const import EntityCategory
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .data_model import LitterBox
 from .const import DOMAIN, WATER_FOUNTAIN_RUN_MODE, SCOOPER_WORK_STATUS_DESC, SCOOPER_WORK_MODES_NAME, \
-    SCOOPER_WORK_MODES_NAME_MAPPING, SCOOPER_INDICATOR_LIGHT_NAME, SCOOPER_INDICATOR_LIGHT_NAME_MAPPING
+    SCOOPER_WORK_MODES_NAME_MAPPING, SCOOPER_INDICATOR_LIGHT_NAME, SCOOPER_INDICATOR_LIGHT_NAME_MAPPING, \
+    LOCAL_NIGHT_MODE_START, LOCAL_NIGHT_MODE_END, DEFAULT_SCOOPER_NIGHT_MODE_START, DEFAULT_SCOOPER_NIGHT_MODE_END
 from .coordinator import CatlinkDevicesCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -743,12 +744,13 @@ class ScooperRunModeSelect(CoordinatorEntity, SelectEntity):
             'deviceId': self.scooper_data.id,
             'workModel': selected_mode,
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'workModel', selected_mode)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.scooper_data.device_detail['workModel'] = selected_mode
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'workModel': selected_mode})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -820,12 +822,13 @@ class ScooperSafeDelayCleanTimeSelect(CoordinatorEntity, SelectEntity):
             'deviceId': self.scooper_data.id,
             'safeTime': option,
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'safeTime', option)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.scooper_data.device_detail['safeTime'] = option
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'safeTime': option})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -898,12 +901,14 @@ class ScooperIndicatorLightMode(CoordinatorEntity, SelectEntity):
             'deviceId': self.scooper_data.id,
             'status': selected_mode,
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(
+            self.scooper_data.id, api, params, 'indicatorLight', selected_mode)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.scooper_data.device_detail['indicatorLight'] = selected_mode
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'indicatorLight': selected_mode})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -962,12 +967,13 @@ class ScooperActionStart(CoordinatorEntity, ButtonEntity):
             'deviceId': self.scooper_data.id,
             'cmd': '01'
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'workStatus', '01')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.scooper_data.device_detail['workStatus'] = '01'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'workStatus': '01'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1026,24 +1032,34 @@ class ScooperActionPause(CoordinatorEntity, ButtonEntity):
             'deviceId': self.scooper_data.id,
             'cmd': '00'
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'workStatus', '00')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.scooper_data.device_detail['workStatus'] = '00'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'workStatus': '00'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
 
-class ScooperNightModeStartTime(CoordinatorEntity, TimeEntity):
-
-    start_time: str = '00:00'
+class ScooperNightModeStartTime(CoordinatorEntity, TimeEntity, RestoreEntity):
 
     def __init__(self, coordinator, scooper_id):
         super().__init__(coordinator)
         self.scooper_id = scooper_id
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state is None:
+            return
+        try:
+            value = time.fromisoformat(last_state.state)
+        except ValueError:
+            return
+        self.coordinator.async_set_local_setting(self.scooper_id, LOCAL_NIGHT_MODE_START, value.strftime('%H:%M'))
+
     @property
     def scooper_data(self) -> LitterBox:
         """Handle coordinator Feeder data."""
@@ -1083,20 +1099,31 @@ class ScooperNightModeStartTime(CoordinatorEntity, TimeEntity):
 
     @property
     def native_value(self) -> time | None:
-        return datetime.strptime(self.start_time, '%H:%M').time()
-
+        return datetime.strptime(
+            self.coordinator.get_local_setting(self.scooper_id, LOCAL_NIGHT_MODE_START, DEFAULT_SCOOPER_NIGHT_MODE_START), '%H:%M').time()
 
     async def async_set_value(self, value: time) -> None:
-        self.start_time = value.strftime('%H:%M')
+        self.coordinator.async_set_local_setting(self.scooper_id, LOCAL_NIGHT_MODE_START, value.strftime('%H:%M'))
+        self.async_write_ha_state()
 
 
-class ScooperNightModeEndTime(CoordinatorEntity, TimeEntity):
-    end_time: str = '23:00'
+class ScooperNightModeEndTime(CoordinatorEntity, TimeEntity, RestoreEntity):
 
     def __init__(self, coordinator, scooper_id):
         super().__init__(coordinator)
         self.scooper_id = scooper_id
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state is None:
+            return
+        try:
+            value = time.fromisoformat(last_state.state)
+        except ValueError:
+            return
+        self.coordinator.async_set_local_setting(self.scooper_id, LOCAL_NIGHT_MODE_END, value.strftime('%H:%M'))
+
     @property
     def scooper_data(self) -> LitterBox:
         """Handle coordinator Feeder data."""
@@ -1136,10 +1163,12 @@ class ScooperNightModeEndTime(CoordinatorEntity, TimeEntity):
 
     @property
     def native_value(self) -> time | None:
-        return datetime.strptime(self.end_time, '%H:%M').time()
+        return datetime.strptime(
+            self.coordinator.get_local_setting(self.scooper_id, LOCAL_NIGHT_MODE_END, DEFAULT_SCOOPER_NIGHT_MODE_END), '%H:%M').time()
 
     async def async_set_value(self, value: time) -> None:
-        self.end_time = value.strftime('%H:%M')
+        self.coordinator.async_set_local_setting(self.scooper_id, LOCAL_NIGHT_MODE_END, value.strftime('%H:%M'))
+        self.async_write_ha_state()
 
 
 class ScooperQuietModeSwitch(CoordinatorEntity, SwitchEntity):
@@ -1200,14 +1229,19 @@ class ScooperQuietModeSwitch(CoordinatorEntity, SwitchEntity):
         params = {
             'deviceId': self.scooper_data.id,
             'enable': 1,
-            'times': ScooperNightModeStartTime.start_time + '-' + ScooperNightModeEndTime.end_time
+            'times': self.coordinator.get_local_setting(
+                self.scooper_id, LOCAL_NIGHT_MODE_START, DEFAULT_SCOOPER_NIGHT_MODE_START)
+            + '-' + self.coordinator.get_local_setting(
+                self.scooper_id, LOCAL_NIGHT_MODE_END, DEFAULT_SCOOPER_NIGHT_MODE_END)
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        # Unkeyed: the write also carries the local night mode times, which may change while quiet mode is on.
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            self.scooper_data.device_detail['keyLockStatus'] = True
+            self.scooper_data.device_detail['quietEnable'] = True
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'quietEnable': True})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1217,12 +1251,13 @@ class ScooperQuietModeSwitch(CoordinatorEntity, SwitchEntity):
             'deviceId': self.scooper_data.id,
             'enable': 0
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'quietEnable', False)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.scooper_data.device_detail['quietEnable'] = False
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'quietEnable': False})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1286,12 +1321,13 @@ class ScooperKeyLockSwitch(CoordinatorEntity, SwitchEntity):
             'deviceId': self.scooper_data.id,
             'lockStatus': '01',
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'keyLock', '01')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            self.scooper_data.device_detail['keyLockStatus'] = '01'
+            self.scooper_data.device_detail['keyLock'] = '01'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'keyLock': '01'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1301,12 +1337,13 @@ class ScooperKeyLockSwitch(CoordinatorEntity, SwitchEntity):
             'deviceId': self.scooper_data.id,
             'lockStatus': '00',
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'keyLock', '00')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            self.scooper_data.device_detail['keyLockStatus'] = '00'
+            self.scooper_data.device_detail['keyLock'] = '00'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'keyLock': '00'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1371,12 +1408,13 @@ class ScooperIndicatorSoundSwitch(CoordinatorEntity, SwitchEntity):
             'kind': '00',
             'panelTone': '01',
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'paneltone', '01')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            self.scooper_data.device_detail['panelTone'] = '01'
+            self.scooper_data.device_detail['paneltone'] = '01'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'paneltone': '01'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1387,11 +1425,12 @@ class ScooperIndicatorSoundSwitch(CoordinatorEntity, SwitchEntity):
             'kind': '00',
             'panelTone': '00',
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.scooper_data.id, api, params, 'paneltone', '00')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            self.scooper_data.device_detail['panelTone'] = '00'
+            self.scooper_data.device_detail['paneltone'] = '00'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.scooper_data.id, {'paneltone': '00'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
\ No newline at end of file
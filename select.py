@@ -27,21 +27,24 @@ async def async_setup_entry(hass: HomeAssistant,
     selects = []
 
     for ft_id, fountain in coordinator.data.water_fountains.items():
+        device_coordinator = coordinator.device_coordinator(ft_id)
         selects.extend((
-            WaterFountainRunModeSelect(coordinator, ft_id),
+            WaterFountainRunModeSelect(device_coordinator, ft_id),
         ))
 
     for feeder_id, feeder in coordinator.data.feeders.items():
+        device_coordinator = coordinator.device_coordinator(feeder_id)
         selects.extend((
-            FeederManualFoodOutNumSelect(coordinator, feeder_id),
-            FeederIndicatorLightSelect(coordinator, feeder_id),
+            FeederManualFoodOutNumSelect(device_coordinator, feeder_id),
+            FeederIndicatorLightSelect(device_coordinator, feeder_id),
         ))
 
     for scooper_id, scooper in coordinator.data.litter_boxes.items():
+        device_coordinator = coordinator.device_coordinator(scooper_id)
         selects.extend((
-            ScooperRunModeSelect(coordinator, scooper_id),
-            ScooperSafeDelayCleanTimeSelect(coordinator, scooper_id),
-            ScooperIndicatorLightMode(coordinator, scooper_id),
+            ScooperRunModeSelect(device_coordinator, scooper_id),
+            ScooperSafeDelayCleanTimeSelect(device_coordinator, scooper_id),
+            ScooperIndicatorLightMode(device_coordinator, scooper_id),
         ))
     async_add_entities(selects)
 
@@ -10,6 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .water_fountain_device import *
 from .feeder_device import *
 from .scooper_device import *
+from .account_device import *
 from .coordinator import CatlinkDevicesCoordinator
 from .const import (
     DOMAIN,
@@ -24,55 +25,63 @@ DATA_KEY = f'{ENTITY_DOMAIN}.{DOMAIN}'
 async def async_setup_entry(hass: HomeAssistant,
                             entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator: CatlinkDevicesCoordinator = hass.data[DOMAIN][entry.entry_id][CATLINK_COORDINATOR]
-    sensors = []
+    sensors = [
+        CatlinkCloudCircuitState(coordinator),
+        CatlinkRateLimiterLevel(coordinator),
+        CatlinkRateLimiterThrottledTime(coordinator),
+        CatlinkQuarantinedDevices(coordinator),
+    ]
 
     for ft_id, fountain in coordinator.data.water_fountains.items():
+        device_coordinator = coordinator.device_coordinator(ft_id)
         sensors.extend((
-            WaterFountainStatus(coordinator, ft_id),
-            WaterFountainWaterLevel(coordinator, ft_id),
-            WaterFountainWaterLevelDesc(coordinator, ft_id),
-            FilterRemainDays(coordinator, ft_id),
-            WaterFountainRunMode(coordinator, ft_id),
-            LastDrinkEvent(coordinator, ft_id),
-            LastFountainEvent(coordinator, ft_id),
-            CatDrinkTotalTimeToday(coordinator, ft_id),
-            CatDrinkCountToday(coordinator, ft_id),
-            WaterFountainWifiStatus(coordinator, ft_id),
-            WaterFountainWifiStrength(coordinator, ft_id),
-            WaterFountainWifiRssi(coordinator, ft_id),
+            WaterFountainStatus(device_coordinator, ft_id),
+            WaterFountainWaterLevel(device_coordinator, ft_id),
+            WaterFountainWaterLevelDesc(device_coordinator, ft_id),
+            FilterRemainDays(device_coordinator, ft_id),
+            WaterFountainRunMode(device_coordinator, ft_id),
+            LastDrinkEvent(device_coordinator, ft_id),
+            LastFountainEvent(device_coordinator, ft_id),
+            CatDrinkTotalTimeToday(device_coordinator, ft_id),
+            CatDrinkCountToday(device_coordinator, ft_id),
+            WaterFountainWifiStatus(device_coordinator, ft_id),
+            WaterFountainWifiStrength(device_coordinator, ft_id),
+            WaterFountainWifiRssi(device_coordinator, ft_id),
         ))
 
     for feeder_id, feeder in coordinator.data.feeders.items():
+        device_coordinator = coordinator.device_coordinator(feeder_id)
         sensors.extend((
-            FeederFoodWeight(coordinator, feeder_id),
-            FeederFoodOutStatus(coordinator, feeder_id),
-            FeederPowerSupplyStatus(coordinator, feeder_id),
-            FeederErrorMessage(coordinator, feeder_id),
-            FeederAutoFoodOutCount(coordinator, feeder_id),
-            FeederDietFoodOutCount(coordinator, feeder_id),
-            FeederManualFoodOutCount(coordinator, feeder_id),
-            FeederTimingFoodOutCount(coordinator, feeder_id),
-            LastEatEvent(coordinator, feeder_id),
-            LastFeederEvent(coordinator, feeder_id),
-            FeederWifiStatus(coordinator, feeder_id),
-            FeederWifiStrength(coordinator, feeder_id),
-            FeederWifiRssi(coordinator, feeder_id),
+            FeederFoodWeight(device_coordinator, feeder_id),
+            FeederFoodOutStatus(device_coordinator, feeder_id),
+            FeederPowerSupplyStatus(device_coordinator, feeder_id),
+            FeederErrorMessage(device_coordinator, feeder_id),
+            FeederAutoFoodOutCount(device_coordinator, feeder_id),
+            FeederDietFoodOutCount(device_coordinator, feeder_id),
+            FeederManualFoodOutCount(device_coordinator, feeder_id),
+            FeederTimingFoodOutCount(device_coordinator, feeder_id),
+            LastEatEvent(device_coordinator, feeder_id),
+            LastFeederEvent(device_coordinator, feeder_id),
+            FeederWifiStatus(device_coordinator, feeder_id),
+            FeederWifiStrength(device_coordinator, feeder_id),
+            FeederWifiRssi(device_coordinator, feeder_id),
         ))
 
     for scooper_id, scooper in coordinator.data.litter_boxes.items():
+        device_coordinator = coordinator.device_coordinator(scooper_id)
         sensors.extend((
-            LitterWeightStatus(coordinator, scooper_id),
-            LitterInductionCleanTimes(coordinator, scooper_id),
-            LitterManualCleanTimes(coordinator, scooper_id),
-            LitterTimingCleanTimes(coordinator, scooper_id),
-            LitterAllClearTimes(coordinator, scooper_id),
-            LastWCEvent(coordinator, scooper_id),
-            LastCleanEvent(coordinator, scooper_id),
-            LitterWorkStatus(coordinator, scooper_id),
-            LitterCurrentMessage(coordinator, scooper_id),
-            ScooperWifiStatus(coordinator, scooper_id),
-            ScooperWifiStrength(coordinator, scooper_id),
-            ScooperWifiRssi(coordinator, scooper_id),
+            LitterWeightStatus(device_coordinator, scooper_id),
+            LitterInductionCleanTimes(device_coordinator, scooper_id),
+            LitterManualCleanTimes(device_coordinator, scooper_id),
+            LitterTimingCleanTimes(device_coordinator, scooper_id),
+            LitterAllClearTimes(device_coordinator, scooper_id),
+            LastWCEvent(device_coordinator, scooper_id),
+            LastCleanEvent(device_coordinator, scooper_id),
+            LitterWorkStatus(device_coordinator, scooper_id),
+            LitterCurrentMessage(device_coordinator, scooper_id),
+            ScooperWifiStatus(device_coordinator, scooper_id),
+            ScooperWifiStrength(device_coordinator, scooper_id),
+            ScooperWifiRssi(device_coordinator, scooper_id),
         ))
     async_add_entities(sensors)
 
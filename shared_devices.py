@@ -0,0 +1,71 @@
+import logging
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, SHARED_DEVICES, DEVICE_SOURCE_OWN
+from .data_model import Feeder, LitterBox, WaterFountain
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SharedDeviceRegistry:
+    """Devices seen by several Catlink accounts, keyed by Catlink device id.
+
+    One account owns the fetching of each device, preferring an account that
+    lists it as its own over one it is shared with. The snapshots it fetches
+    are handed to the listeners of the other accounts, which skip polling the
+    device while a snapshot is available.
+    """
+
+    def __init__(self) -> None:
+        self._owners: dict[int, tuple[str, str | None]] = {}
+        self._snapshots: dict[int, Feeder | LitterBox | WaterFountain] = {}
+        self._listeners: dict[str, Callable[[Feeder | LitterBox | WaterFountain], None]] = {}
+
+    def claim(self, device_id, account: str, source: str | None) -> bool:
+        """Return whether ``account`` fetches the device, taking it over when unowned or held by a sharee."""
+
+        owner = self._owners.get(device_id)
+        if owner is None or (source == DEVICE_SOURCE_OWN and owner[1] != DEVICE_SOURCE_OWN):
+            if owner is not None and owner[0] != account:
+                _LOGGER.debug('Device %s is now fetched by its owner %s instead of %s', device_id, account, owner[0])
+            owner = self._owners[device_id] = (account, source)
+        return owner[0] == account
+
+    def snapshot(self, device_id) -> Feeder | LitterBox | WaterFountain | None:
+        return self._snapshots.get(device_id)
+
+    def publish(self, account: str, device_data: Feeder | LitterBox | WaterFountain) -> None:
+        """Store a fresh snapshot and hand it to the other accounts."""
+
+        self._snapshots[device_data.id] = device_data
+        for listener_account, listener in list(self._listeners.items()):
+            if listener_account != account:
+                listener(device_data)
+
+    def listen(self, account: str, listener: Callable[[Feeder | LitterBox | WaterFountain], None]) -> None:
+        self._listeners[account] = listener
+
+    def sync_inventory(self, account: str, device_ids) -> None:
+        """Give up the devices an account no longer lists."""
+
+        device_ids = set(device_ids)
+        for device_id, owner in list(self._owners.items()):
+            if owner[0] == account and device_id not in device_ids:
+                del self._owners[device_id]
+
+    def release(self, account: str) -> None:
+        """Drop an unloaded account; its devices are claimed by the next account polling them."""
+
+        self._listeners.pop(account, None)
+        self.sync_inventory(account, ())
+
+
+def async_get_shared_devices(hass: HomeAssistant) -> SharedDeviceRegistry:
+    """Return the registry shared by every config entry."""
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if SHARED_DEVICES not in domain_data:
+        domain_data[SHARED_DEVICES] = SharedDeviceRegistry()
+    return domain_data[SHARED_DEVICES]
@@ -26,23 +26,26 @@ async def async_setup_entry(hass: HomeAssistant,
     switches = []
 
     for ft_id, fountain in coordinator.data.water_fountains.items():
+        device_coordinator = coordinator.device_coordinator(ft_id)
         switches.extend((
-            WaterFountainChildLock(coordinator, ft_id),
-            WaterFountainIndicatorLight(coordinator, ft_id),
-            WaterFountainIndicatorSound(coordinator, ft_id),
-            WaterFountainNightModeSwitch(coordinator, ft_id)
+            WaterFountainChildLock(device_coordinator, ft_id),
+            WaterFountainIndicatorLight(device_coordinator, ft_id),
+            WaterFountainIndicatorSound(device_coordinator, ft_id),
+            WaterFountainNightModeSwitch(device_coordinator, ft_id)
         ))
 
     for feeder_id, feeder in coordinator.data.feeders.items():
+        device_coordinator = coordinator.device_coordinator(feeder_id)
         switches.extend((
-            FeederAutoFillFoodSwitch(coordinator, feeder_id),
-            FeederLockSwitch(coordinator, feeder_id),
+            FeederAutoFillFoodSwitch(device_coordinator, feeder_id),
+            FeederLockSwitch(device_coordinator, feeder_id),
         ))
 
     for scooper_id, scooper in coordinator.data.litter_boxes.items():
+        device_coordinator = coordinator.device_coordinator(scooper_id)
         switches.extend((
-            ScooperQuietModeSwitch(coordinator, scooper_id),
-            ScooperKeyLockSwitch(coordinator, scooper_id),
-            ScooperIndicatorSoundSwitch(coordinator, scooper_id),
+            ScooperQuietModeSwitch(device_coordinator, scooper_id),
+            ScooperKeyLockSwitch(device_coordinator, scooper_id),
+            ScooperIndicatorSoundSwitch(device_coordinator, scooper_id),
         ))
     async_add_entities(switches)
@@ -25,15 +25,17 @@ async def async_setup_entry(hass: HomeAssistant,
     time_elem = []
 
     for ft_id, fountain in coordinator.data.water_fountains.items():
+        device_coordinator = coordinator.device_coordinator(ft_id)
         time_elem.extend((
-            WaterFountainNightModeStartTime(coordinator, ft_id),
-            WaterFountainNightModeEndTime(coordinator, ft_id)
+            WaterFountainNightModeStartTime(device_coordinator, ft_id),
+            WaterFountainNightModeEndTime(device_coordinator, ft_id)
         ))
 
     for scooper_id, scooper in coordinator.data.litter_boxes.items():
+        device_coordinator = coordinator.device_coordinator(scooper_id)
         time_elem.extend((
-            ScooperNightModeStartTime(coordinator, scooper_id),
-            ScooperNightModeEndTime(coordinator, scooper_id)
+            ScooperNightModeStartTime(device_coordinator, scooper_id),
+            ScooperNightModeEndTime(device_coordinator, scooper_id)
         ))
 
     async_add_entities(time_elem)
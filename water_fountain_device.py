@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import Any
 from datetime import time, datetime
@@ -757,12 +756,13 @@ class WaterFountainChildLock(CoordinatorEntity, SwitchEntity):
             'deviceId': self.fountain_data.id,
             'lockStatus': 1
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'childLock', 0)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['childLock'] = 0
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'childLock': 0})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -772,12 +772,13 @@ class WaterFountainChildLock(CoordinatorEntity, SwitchEntity):
             'deviceId': self.fountain_data.id,
             'lockStatus': 0
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'childLock', 1)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['childLock'] = 1
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'childLock': 1})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -838,12 +839,13 @@ class WaterFountainIndicatorLight(CoordinatorEntity, SwitchEntity):
             'deviceId': self.fountain_data.id,
             'status': 'OPEN'
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'pureLightStatus', 'OPEN')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['pureLightStatus'] = 'OPEN'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'pureLightStatus': 'OPEN'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -853,12 +855,13 @@ class WaterFountainIndicatorLight(CoordinatorEntity, SwitchEntity):
             'deviceId': self.fountain_data.id,
             'status': 'CLOSE'
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'pureLightStatus', 'CLOSE')
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['pureLightStatus'] = 'CLOSE'
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'pureLightStatus': 'CLOSE'})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -919,12 +922,13 @@ class WaterFountainIndicatorSound(CoordinatorEntity, SwitchEntity):
             'deviceId': self.fountain_data.id,
             'lockStatus': 1
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'keyTone', 0)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            self.fountain_data.device_detail['keyTone'] = 1
+            self.fountain_data.device_detail['keyTone'] = 0
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'keyTone': 0})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -934,12 +938,13 @@ class WaterFountainIndicatorSound(CoordinatorEntity, SwitchEntity):
             'deviceId': self.fountain_data.id,
             'lockStatus': 0
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'keyTone', 1)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            self.fountain_data.device_detail['keyTone'] = 0
+            self.fountain_data.device_detail['keyTone'] = 1
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'keyTone': 1})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1003,12 +1008,13 @@ class WaterFountainNightModeSwitch(CoordinatorEntity, SwitchEntity):
             'startTime': self.fountain_data.device_detail['nightModeStartTime'],
             'endTime': self.fountain_data.device_detail['nightModeEndTime']
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'nightModeFlag', True)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['nightModeFlag'] = True
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'nightModeFlag': True})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1020,12 +1026,13 @@ class WaterFountainNightModeSwitch(CoordinatorEntity, SwitchEntity):
             'startTime': '',
             'endTime': ''
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'nightModeFlag', False)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['nightModeFlag'] = False
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'nightModeFlag': False})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1083,9 +1090,11 @@ class WaterFountainFluffyHair(CoordinatorEntity, ButtonEntity):
         params = {
             'deviceId': self.fountain_data.id,
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id)
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1159,12 +1168,13 @@ class WaterFountainRunModeSelect(CoordinatorEntity, SelectEntity):
             'deviceId': self.fountain_data.id,
             'runMode': selected_mode,
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(self.fountain_data.id, api, params, 'runMode', selected_mode)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['runMode'] = selected_mode
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'runMode': selected_mode})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1288,12 +1298,14 @@ class WaterFountainNightModeStartTime(CoordinatorEntity, TimeEntity):
             'startTime': time_str,
             'endTime': self.fountain_data.device_detail['nightModeEndTime']
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(
+            self.fountain_data.id, api, params, 'nightModeStartTime', time_str)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['nightModeStartTime'] = time_str
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'nightModeStartTime': time_str})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)
 
@@ -1360,11 +1372,13 @@ class WaterFountainNightModeEndTime(CoordinatorEntity, TimeEntity):
             'startTime': self.fountain_data.device_detail['nightModeStartTime'],
             'endTime': time_str
         }
-        resp = await self.coordinator.client.request(api, params, 'POST')
+        resp = await self.coordinator.async_send_command(
+            self.fountain_data.id, api, params, 'nightModeEndTime', time_str)
+        if resp is None:
+            return
         if resp['success'] and resp['returnCode'] == 0:
             self.fountain_data.device_detail['nightModeEndTime'] = time_str
             self.async_write_ha_state()
-            await asyncio.sleep(5)
-            await self.coordinator.async_request_refresh()
+            self.coordinator.async_confirm_command(self.fountain_data.id, {'nightModeEndTime': time_str})
         else:
             _LOGGER.warning('Request api %s with %s failed, Resp %s', api, params, resp)